@@ -5,19 +5,33 @@ This module provides the Flask application factory pattern for creating
 and configuring the API application with proper extensions and blueprints.
 """
 import os
+import shutil
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 import logging
-import uuid
+import redis
+from itertools import count
 from flask import Flask, request, g
 from flask_cors import CORS
 from flask_caching import Cache
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flasgger import Swagger, swag_from
-from owlready2 import get_ontology, default_world
+from owlready2 import World, get_ontology, default_world
 
 from backend.config import get_config
+from backend.app.utils.file_lock import file_lock
+from backend.app.utils.json_provider import OrjsonProvider
+from backend.celery_config import celery
 
 
 # Initialize extensions
@@ -28,6 +42,38 @@ limiter = None
 # Global ontology instance
 onto = None
 
+# Request IDs are "<pid>-<counter>": unique per worker and far cheaper than uuid4()
+_request_pid = os.getpid()
+_request_counter = count()
+
+
+def _reset_request_ids():
+    """Give forked workers (e.g. gunicorn with preload_app) their own ID space."""
+    global _request_pid, _request_counter
+    _request_pid = os.getpid()
+    _request_counter = count()
+
+
+os.register_at_fork(after_in_child=_reset_request_ids)
+
+# Read size used when streaming the remote ontology to disk
+DOWNLOAD_CHUNK_SIZE = 262144
+# Parallel HTTP Range requests used for large ontology downloads
+DOWNLOAD_WORKERS = 4
+
+# Redis keys coordinating a single ontology download across workers
+ONTOLOGY_DOWNLOAD_LOCK_KEY = "feinschmecker:ontology_downloading"
+ONTOLOGY_READY_CHANNEL = "feinschmecker:ontology_ready"
+
+# Deletes the download lock only if it still holds our token, so a holder
+# whose lock already expired cannot release another process's lock
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 def setup_logging(app):
     """Configure application logging."""
@@ -44,6 +90,295 @@ def setup_logging(app):
     app.logger.setLevel(log_level)
 
 
+def _probe_ranges(url, headers, timeout):
+    """
+    Ask the server with ``HEAD`` whether ``url`` can be fetched in parallel slices.
+
+    Ranged mode needs a strong validator (ETag or Last-Modified) to send as
+    ``If-Range``; without one, slices of a file that changes mid-download
+    would be stitched together from different versions.
+
+    Returns:
+        Tuple of (length, etag, validator) for a ranged download, where
+        ``etag`` may be None if only Last-Modified was sent, or None when a
+        single GET should be used. A rejected HEAD (e.g. 405 or 403 from a
+        CDN) also yields None, since GET may still work.
+
+    Raises:
+        HTTPError: 304 if the cached copy is still current
+    """
+    try:
+        with urlopen(Request(url, headers=headers, method="HEAD"), timeout=timeout) as head:
+            length = int(head.headers.get("Content-Length") or 0)
+            etag = head.headers.get("ETag")
+            # Weak ETags are not allowed in If-Range
+            if etag and etag.startswith("W/"):
+                etag = None
+            validator = etag or head.headers.get("Last-Modified")
+            accepts_ranges = head.headers.get("Accept-Ranges") == "bytes"
+    except HTTPError as e:
+        if e.code == 304:
+            raise
+        return None
+
+    if validator and accepts_ranges and length > DOWNLOAD_CHUNK_SIZE * DOWNLOAD_WORKERS:
+        return length, etag, validator
+    return None
+
+
+def _download_ranges(url, fd, length, validator, timeout):
+    """
+    Fetch ``length`` bytes of ``url`` with parallel HTTP Range requests.
+
+    Each worker thread writes its slice at the right offset of the already
+    preallocated file descriptor ``fd``. ``validator`` is sent as ``If-Range``
+    so every slice comes from the same version of the file; a server holding
+    a newer version answers 200 instead of 206 and the download fails.
+    """
+    part_size = -(-length // DOWNLOAD_WORKERS)
+
+    def fetch(start):
+        end = min(start + part_size, length) - 1
+        headers = {"Range": f"bytes={start}-{end}", "If-Range": validator}
+        with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+            if resp.status != 206:
+                raise IOError(f"Server ignored range request for bytes {start}-{end}")
+            offset = start
+            while True:
+                chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+        if offset != end + 1:
+            raise IOError(f"Incomplete range download for bytes {start}-{end}")
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        # list() re-raises the first failure from any slice
+        list(pool.map(fetch, range(0, length, part_size)))
+
+
+def download_ontology(app, url):
+    """
+    Download a remote ontology into the local cache directory.
+
+    The file is written into a uniquely named temporary file in the cache
+    directory and atomically moved into place, so readers never observe a
+    partially written ontology. When a cached copy exists, a conditional
+    request is sent and the download is skipped if the server answers
+    ``304 Not Modified``. Large files are fetched with parallel Range
+    requests when the server supports them and sends a validator; otherwise,
+    including when it rejects ``HEAD``, a single GET is used.
+
+    Args:
+        app: Flask application instance
+        url: HTTP(S) URL of the ontology file
+
+    Returns:
+        Path to the cached ontology file
+    """
+    cache_dir = Path(app.config["ONTOLOGY_CACHE_DIR"])
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    absolute_path = cache_dir / app.config["ONTOLOGY_CACHE_FILENAME"]
+    etag_path = absolute_path.with_name(absolute_path.name + ".etag")
+    timeout = app.config["REQUEST_TIMEOUT"]
+
+    headers = {}
+    if absolute_path.exists():
+        headers["If-Modified-Since"] = formatdate(absolute_path.stat().st_mtime, usegmt=True)
+        if etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text().strip()
+
+    app.logger.info("Downloading ontology from %s to %s", url, absolute_path)
+    tmp_name = None
+    try:
+        ranged = _probe_ranges(url, headers, timeout)
+
+        # A unique name per process avoids workers clobbering each other's download
+        with tempfile.NamedTemporaryFile(
+            dir=cache_dir, prefix=absolute_path.name + ".", suffix=".part", delete=False
+        ) as fh:
+            tmp_name = fh.name
+            if ranged:
+                length, etag, validator = ranged
+                os.ftruncate(fh.fileno(), length)
+                _download_ranges(url, fh.fileno(), length, validator, timeout)
+            else:
+                with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+                    etag = resp.headers.get("ETag")
+                    # Large reads keep the number of read()/write() syscalls low
+                    # for multi-MB files; copyfileobj runs the loop in C.
+                    shutil.copyfileobj(resp, fh, DOWNLOAD_CHUNK_SIZE)
+        os.replace(tmp_name, absolute_path)
+        tmp_name = None
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        app.logger.info("Cached ontology at %s is up to date", absolute_path)
+        return absolute_path
+    finally:
+        if tmp_name is not None:
+            os.unlink(tmp_name)
+
+    if etag:
+        etag_path.write_text(etag)
+    else:
+        etag_path.unlink(missing_ok=True)
+
+    return absolute_path
+
+
+def fetch_ontology(app, url):
+    """
+    Download the remote ontology once for all workers sharing a Redis instance.
+
+    The worker that wins the Redis lock downloads the file and announces it on
+    a pub/sub channel; the others wait for that signal (bounded by
+    ``ONTOLOGY_LOCK_TIMEOUT``) and then use the shared cached file. A waiter
+    that gets no signal, and every worker when Redis is down, downloads on
+    its own.
+
+    Args:
+        app: Flask application instance
+        url: HTTP(S) URL of the ontology file
+
+    Returns:
+        Path to the cached ontology file
+    """
+    timeout = app.config["ONTOLOGY_LOCK_TIMEOUT"]
+    # The pid alone is not unique across containers sharing one Redis
+    token = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        r = redis.from_url(app.config["REDIS_URL"], socket_connect_timeout=1)
+        # Subscribe before trying the lock so the ready signal cannot be missed
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(ONTOLOGY_READY_CHANNEL)
+        acquired = r.set(ONTOLOGY_DOWNLOAD_LOCK_KEY, token, nx=True, ex=timeout)
+    except redis.RedisError as e:
+        app.logger.warning("Redis unavailable for download coordination (%s), downloading directly", e)
+        return download_ontology(app, url)
+
+    try:
+        if acquired:
+            try:
+                path = download_ontology(app, url)
+            finally:
+                r.eval(_RELEASE_LOCK_SCRIPT, 1, ONTOLOGY_DOWNLOAD_LOCK_KEY, token)
+            r.publish(ONTOLOGY_READY_CHANNEL, str(path))
+            return path
+
+        app.logger.info("Another worker is downloading the ontology, waiting for it")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if pubsub.get_message(timeout=1.0) is not None:
+                return Path(app.config["ONTOLOGY_CACHE_DIR"]) / app.config["ONTOLOGY_CACHE_FILENAME"]
+            # The lock disappears without a signal if the downloader failed
+            if not r.exists(ONTOLOGY_DOWNLOAD_LOCK_KEY):
+                app.logger.warning("Ontology download by another worker failed, downloading directly")
+                break
+        else:
+            app.logger.warning(
+                "No ontology ready signal within %ss, downloading directly", timeout
+            )
+
+        # The cached file may be missing, partial or stale, so never use it unchecked
+        return download_ontology(app, url)
+    finally:
+        pubsub.close()
+
+
+def _build_quadstore(app, source_path, quadstore, iri_path):
+    """
+    Parse ``source_path`` into a new quadstore file and swap it in.
+
+    The parse uses a separate World that is closed before returning, so no
+    SQLite connection to the file outlives this call.
+    """
+    app.logger.info("Parsing %s into quadstore at %s", source_path, quadstore)
+    tmp_path = quadstore.with_name(quadstore.name + ".part")
+    tmp_path.unlink(missing_ok=True)
+    world = World(filename=str(tmp_path))
+    try:
+        parsed = world.get_ontology(source_path.as_uri()).load()
+        base_iri = parsed.base_iri
+        world.save()
+    finally:
+        world.close()
+    os.replace(tmp_path, quadstore)
+    iri_path.write_text(base_iri)
+
+
+def open_ontology_quadstore(app, source_path):
+    """
+    Load an ontology file through a persistent Owlready2 SQLite quadstore.
+
+    The first load parses the RDF source into the quadstore; later loads reuse
+    it as long as it is newer than the source, skipping the RDF parse entirely.
+    Concurrent processes are serialized so only one of them parses.
+
+    The quadstore is copied into ``default_world``'s in-memory database with
+    SQLite's backup API and the file connection is closed again. With
+    gunicorn's ``preload_app`` the master runs this, and forked workers must
+    not share an SQLite connection, so each of them gets its own in-memory
+    copy of the world exactly like a plain parse would.
+
+    Args:
+        app: Flask application instance
+        source_path: Path to the RDF/N-Triples ontology file
+
+    Returns:
+        The loaded ontology object
+    """
+    # Owlready2 can only adopt an existing database while the world is empty
+    if len(default_world.graph) > 1:
+        app.logger.info("Ontology world already in use, parsing %s directly", source_path)
+        return get_ontology(source_path.as_uri()).load()
+
+    cache_dir = Path(app.config["ONTOLOGY_CACHE_DIR"])
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    quadstore = cache_dir / app.config["ONTOLOGY_QUADSTORE_FILENAME"]
+    # Base IRI of the parsed ontology, needed to find it again in the quadstore
+    iri_path = quadstore.with_name(quadstore.name + ".iri")
+
+    with file_lock(quadstore.with_name(quadstore.name + ".lock")):
+        fresh = (
+            quadstore.exists()
+            and iri_path.exists()
+            and quadstore.stat().st_mtime >= source_path.stat().st_mtime
+        )
+        if fresh:
+            app.logger.info("Reusing ontology quadstore at %s", quadstore)
+        else:
+            for stale in (quadstore, iri_path):
+                stale.unlink(missing_ok=True)
+            _build_quadstore(app, source_path, quadstore, iri_path)
+
+        memory = sqlite3.connect(":memory:", check_same_thread=False)
+        stored = sqlite3.connect(quadstore.as_uri() + "?mode=ro", uri=True)
+        try:
+            stored.backup(memory)
+        finally:
+            stored.close()
+        base_iri = iri_path.read_text().strip()
+
+    default_world.set_backend(filename=str(quadstore), connection=memory, exclusive=False)
+    return default_world.get_ontology(base_iri)
+
+
+def _log_ontology_head(app, path, max_lines=80, max_bytes=65536):
+    """
+    Log the beginning of an ontology file that failed to parse.
+
+    Reads at most ``max_bytes`` so a huge file cannot blow up worker memory.
+    """
+    try:
+        with path.open("r", errors="replace") as fh:
+            head = fh.read(max_bytes).splitlines()[:max_lines]
+    except OSError:
+        return
+    app.logger.error("First %d lines of %s:\n%s", len(head), path, "\n".join(head))
+
+
 def load_ontology(app):
     """Load the ontology at application startup."""
     global onto
@@ -54,28 +389,91 @@ def load_ontology(app):
         ontology_path = 'data/feinschmecker.nt'
 
     try:
-        # If it's not a URL, treat it as a local file path.
-        if not (ontology_path.startswith('http://') or ontology_path.startswith('https://')):
+        if ontology_path.startswith('http://') or ontology_path.startswith('https://'):
+            try:
+                absolute_path = fetch_ontology(app, ontology_path)
+            except Exception as e:
+                # Fall back to a previously cached copy if the download fails
+                absolute_path = Path(app.config["ONTOLOGY_CACHE_DIR"]) / app.config["ONTOLOGY_CACHE_FILENAME"]
+                if not absolute_path.exists():
+                    raise
+                app.logger.warning("Ontology download failed (%s), using cached copy at %s", e, absolute_path)
+        else:
+            # Not a URL, treat it as a local file path.
             # app.root_path is /app/backend/app, so project root is two levels up.
             project_root = Path(app.root_path).parent.parent
             absolute_path = (project_root / ontology_path).resolve()
             
             if not absolute_path.exists():
-                app.logger.error(f"Ontology file not found at resolved path: {absolute_path}")
+                app.logger.error("Ontology file not found at resolved path: %s", absolute_path)
                 raise FileNotFoundError(f"Ontology file not found: {absolute_path}")
-            ontology_uri = absolute_path.as_uri()
-        else:
-            ontology_uri = ontology_path
 
-        app.logger.info(f"Loading ontology from {ontology_uri}")
-        onto = get_ontology(ontology_uri).load()
+        app.logger.info("Loading ontology from %s", absolute_path)
+        try:
+            onto = open_ontology_quadstore(app, absolute_path)
+        except Exception:
+            # Typically an HTML error page or truncated file saved as the ontology
+            _log_ontology_head(app, absolute_path)
+            raise
         app.logger.info("Ontology loaded successfully")
         return onto
     except Exception as e:
-        app.logger.error(f"Failed to load ontology from {ontology_path}: {str(e)}", exc_info=True)
+        app.logger.error("Failed to load ontology from %s: %s", ontology_path, e, exc_info=True)
         raise
 
 
+def check_owlready2_optimized(app):
+    """
+    Make sure owlready2's compiled parser/serializer is in use.
+
+    Without the ``owlready2_optimized`` extension every ontology load and
+    save runs through the pure-Python code path.
+
+    Raises:
+        RuntimeError: If the extension is missing and OWLREADY2_REQUIRE_OPTIMIZED is set
+    """
+    try:
+        import owlready2_optimized  # noqa: F401
+    except ImportError:
+        if app.config["OWLREADY2_REQUIRE_OPTIMIZED"]:
+            raise RuntimeError(
+                "owlready2_optimized is not importable; reinstall owlready2 with a C compiler available"
+            )
+        app.logger.warning("owlready2_optimized not available, using the slower pure-Python parser")
+
+
+def warm_celery_connections(app):
+    """
+    Open the Celery broker and result backend connections ahead of time.
+
+    Otherwise the first task submission and status poll of every worker pay
+    the connection setup latency. Call it once per serving process, after
+    any fork. The warm-up runs on a daemon thread so an unreachable Redis
+    cannot block the caller, and failures are only logged.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        The warm-up thread
+    """
+    # The result backend is thread-local in Celery; resolve the caller's one
+    # so a background warm-up opens the pool the caller will actually use
+    backend = celery.backend
+
+    def warm():
+        try:
+            backend.client.ping()
+            with celery.producer_pool.acquire(block=True, timeout=1) as producer:
+                producer.connection.ensure_connection(max_retries=1)
+        except Exception as e:
+            app.logger.warning("Could not warm up Celery connections: %s", e)
+
+    thread = threading.Thread(target=warm, name="celery-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def create_app(config_name=None):
     """
     Application factory for creating Flask app instances.
@@ -88,11 +486,19 @@ def create_app(config_name=None):
         Configured Flask application instance
     """
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Load configuration
     config_class = get_config(config_name)
     app.config.from_object(config_class)
 
+    # Resolve the per-request rate limit once instead of on every request
+    app.config["RATELIMIT_DEFAULT_RESOLVED"] = (
+        app.config.get("RATELIMIT_DEFAULT", "100 per minute")
+        if app.config.get("RATELIMIT_ENABLED", True)
+        else "1000000 per minute"  # Very high limit when disabled
+    )
+
     # Setup logging and record factory first (before any logging calls)
     setup_logging(app)
 
@@ -125,14 +531,16 @@ def create_app(config_name=None):
     global limiter
     if app.config["RATELIMIT_ENABLED"]:
         storage_uri = app.config.get("RATELIMIT_STORAGE_URL", "memory://")
+        strategy = app.config.get("RATELIMIT_STRATEGY", "moving-window")
         limiter = Limiter(
             key_func=get_remote_address,
             default_limits=[],
             storage_uri=storage_uri,
+            strategy=strategy,
             app=app,
         )
-        app.logger.info(f"Rate limiting enabled: {app.config['RATELIMIT_DEFAULT']}")
-        app.logger.info(f"Rate limiting storage: {storage_uri}")
+        app.logger.info("Rate limiting enabled: %s", app.config["RATELIMIT_DEFAULT"])
+        app.logger.info("Rate limiting storage: %s (%s)", storage_uri, strategy)
     else:
         # Create limiter without app if rate limiting is disabled
         limiter = Limiter(key_func=get_remote_address, default_limits=[])
@@ -175,13 +583,14 @@ def create_app(config_name=None):
     app.logger.info("Swagger documentation initialized at /apidocs/")
 
     # Load ontology
+    check_owlready2_optimized(app)
     with app.app_context():
         load_ontology(app)
 
     # Request ID middleware
     @app.before_request
     def before_request():
-        g.request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        g.request_id = request.headers.get("X-Request-ID") or f"{_request_pid:x}-{next(_request_counter):x}"
 
     # Register blueprints
     from backend.app.api import api_bp
@@ -198,7 +607,7 @@ def create_app(config_name=None):
             "endpoints": {"recipes": "/recipes"},
         }
 
-    app.logger.info(f"Feinschmecker API initialized in {config_name or 'default'} mode")
+    app.logger.info("Feinschmecker API initialized in %s mode", config_name or "default")
 
     return app
 
@@ -13,8 +13,10 @@ from flask import request, current_app
 from rdflib import Graph
 from owlready2 import get_ontology, default_world
 
+import backend.app as app_module
 from backend.app.api import api_bp
-from backend.app import limiter
+from backend.app import limiter, cache, get_ontology_instance
+from backend.app.api.recipes import search_recipes_sync
 from backend.app.utils.response import (
     success_response,
     validation_error_response,
@@ -23,6 +25,9 @@ from backend.app.utils.response import (
 
 logger = logging.getLogger(__name__)
 
+# (ontology, counts) of the last ontology described by /ontology/info
+_ontology_stats = None
+
 ALLOWED_EXTENSIONS = {'rdf', 'owl', 'ttl', 'n3', 'nt', 'jsonld', 'xml'}
 UPLOAD_FOLDER = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
@@ -75,9 +80,11 @@ def reload_ontology(ontology_file):
         new_onto = get_ontology(file_url).load()
         
         # Update global ontology instance
-        import backend.app as app_module
         app_module.onto = new_onto
         
+        # Only recipe search results depend on the ontology contents
+        cache.delete_memoized(search_recipes_sync)
+        
         logger.info("Ontology reloaded successfully")
         return True, None
         
@@ -246,8 +253,6 @@ def get_ontology_info():
         JSON response with ontology metadata
     """
     try:
-        from backend.app import get_ontology_instance
-        
         onto = get_ontology_instance()
         
         if not onto:
@@ -257,18 +262,20 @@ def get_ontology_info():
                 status_code=500
             )
         
-        # Collect basic stats
-        classes = list(onto.classes())
-        individuals = list(onto.individuals())
-        properties = list(onto.properties())
+        # Collect basic stats, once per loaded ontology
+        global _ontology_stats
+        if _ontology_stats is None or _ontology_stats[0] is not onto:
+            _ontology_stats = (onto, {
+                'class_count': sum(1 for _ in onto.classes()),
+                'individual_count': sum(1 for _ in onto.individuals()),
+                'property_count': sum(1 for _ in onto.properties()),
+            })
         
         return success_response(
             data={
                 'base_iri': onto.base_iri,
                 'name': onto.name,
-                'class_count': len(classes),
-                'individual_count': len(individuals),
-                'property_count': len(properties)
+                **_ontology_stats[1],
             },
             message="Ontology information retrieved successfully"
         )
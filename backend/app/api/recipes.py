@@ -6,6 +6,8 @@ validation, and caching support.
 """
 
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from flask import request, current_app
 from flasgger import swag_from
 from celery.result import AsyncResult
@@ -24,29 +26,72 @@ from backend.app.services.recipe_service import RecipeService
 
 from backend.app.utils.validators.recipe_validator import (
     validate_recipe_filters,
+    validate_recipe_payload,
     ValidationError,
 )
 from backend.app.utils.response import (
     success_response,
+    error_response,
     validation_error_response,
     internal_error_response,
 )
 
 logger = logging.getLogger(__name__)
 
+# Exception names reported for timed-out tasks whose class is not importable here
+TIMEOUT_ERROR_TYPES = frozenset({"TimeLimitExceeded", "SoftTimeLimitExceeded", "TimeoutError"})
 
-def make_cache_key():
-    """Generate cache key based on request parameters."""
-    # Sort parameters for consistent cache keys
-    params = sorted(request.args.items())
-    return f"recipes:{str(params)}"
+
+# Config values validate_recipe_filters reads; they are part of the memo key
+VALIDATION_CONFIG_KEYS = (
+    "VALID_MEAL_TYPES", "MIN_DIFFICULTY", "MAX_DIFFICULTY", "DEFAULT_PAGE_SIZE", "MAX_PAGE_SIZE",
+)
+
+
+def _validation_config():
+    """Return the config values filter validation depends on as a hashable tuple."""
+    config = current_app.config
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (config.get(key) for key in VALIDATION_CONFIG_KEYS)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _validate_filters_cached(query_items, config_values):
+    """
+    Validate recipe filters, memoized per distinct set of query parameters.
+
+    ``query_items`` is a sorted tuple of the raw query items and
+    ``config_values`` the result of _validation_config(). The latter is only
+    part of the key, so another app or changed limits get their own entries.
+    The filters are returned as a read-only mapping with the ingredient list
+    turned into a tuple, so the shared result cannot be mutated.
+    """
+    filters, page, per_page = validate_recipe_filters(dict(query_items))
+    if "ingredients" in filters:
+        filters["ingredients"] = tuple(filters["ingredients"])
+    return MappingProxyType(filters), page, per_page
+
+
+@cache.memoize()
+def search_recipes_sync(filters_key, page, per_page):
+    """
+    Run a recipe search synchronously against the in-process ontology.
+
+    Used only as a fallback when Celery submission fails. Results are memoized
+    on the validated filters, so ``filters_key`` is a sorted tuple of items.
+    """
+    ontology = get_ontology_instance()
+    if ontology is None:
+        raise RuntimeError("Ontology is not loaded in application context")
+
+    service = RecipeService(ontology)
+    return service.get_recipes(dict(filters_key), page, per_page)
 
 
 @api_bp.route("/recipes", methods=["GET"])
-@limiter.limit(lambda: current_app.config.get("RATELIMIT_DEFAULT", "100 per minute") 
-               if current_app.config.get("RATELIMIT_ENABLED", True) 
-               else "1000000 per minute")  # Very high limit when disabled
-@cache.cached(timeout=None, key_prefix=make_cache_key)  # Use config timeout
+@limiter.limit(lambda: current_app.config["RATELIMIT_DEFAULT_RESOLVED"])
 @swag_from("swagger_specs/recipes_get.yml")
 def get_recipes():
     """
@@ -93,17 +138,19 @@ def get_recipes():
             }
         }
     """
-    logger.info(f"Received recipe search request with params: {request.args.to_dict()}")
+    # Get raw filters from request
+    raw_filters = request.args.to_dict()
+    logger.info("Received recipe search request with params: %s", raw_filters)
 
     try:
-        # Get raw filters from request
-        raw_filters = request.args.to_dict()
 
         # Validate and normalize filters
         try:
-            validated_filters = validate_recipe_filters(raw_filters)
+            validated_filters, page, per_page = _validate_filters_cached(
+                tuple(sorted(raw_filters.items())), _validation_config()
+            )
         except ValidationError as e:
-            logger.warning(f"Validation error: {e.errors}")
+            logger.warning("Validation error: %s", e.errors)
             return validation_error_response(e.errors)
         
         # DEV/TEST: przeniesienie flag testowych do filters,
@@ -114,21 +161,15 @@ def get_recipes():
         # if "force_soft_timeout" in raw_filters:
         #     validated_filters["force_soft_timeout"] = raw_filters["force_soft_timeout"]
 
-        # Extract pagination parameters
-        page = validated_filters.pop("page", 1)
-        per_page = validated_filters.pop(
-            "per_page", current_app.config["DEFAULT_PAGE_SIZE"]
-        )
-
         # Prefer async processing via Celery, but gracefully fallback to
         # synchronous processing with clear error information when Celery
         # submission fails (e.g. broker down) – helps debugging and UX.
         try:
-            task = search_recipes_async.delay(validated_filters, page, per_page)
+            task = search_recipes_async.delay(dict(validated_filters), page, per_page)
 
             logger.info(
-                f"Submitted async recipe search task {task.id} for "
-                f"page={page}, per_page={per_page}, filters={validated_filters}"
+                "Submitted async recipe search task %s for page=%s, per_page=%s, filters=%s",
+                task.id, page, per_page, validated_filters,
             )
 
             # Return only task id – frontend polls `/recipes/tasks/<id>`.
@@ -138,21 +179,32 @@ def get_recipes():
             )
 
         except Exception as celery_exc:
+            # Without a local ontology the fallback cannot succeed; fail fast
+            # and skip building a traceback for every request.
+            if get_ontology_instance() is None:
+                logger.error(
+                    "Failed to submit Celery task for recipe search and no ontology is loaded: %s",
+                    celery_exc,
+                )
+                return error_response(
+                    message="Service temporarily unavailable: ontology failed to load",
+                    code="SERVICE_UNAVAILABLE",
+                    status_code=503,
+                )
+
             # Log Celery/broker submission failure and attempt synchronous fallback
             logger.error(
-                f"Failed to submit Celery task for recipe search: {celery_exc}",
+                "Failed to submit Celery task for recipe search: %s",
+                celery_exc,
                 exc_info=True,
             )
 
             # Try to run the query synchronously as a best-effort fallback so
             # clients still get results instead of opaque failures.
             try:
-                ontology = get_ontology_instance()
-                if ontology is None:
-                    raise RuntimeError("Ontology is not loaded in application context")
-
-                service = RecipeService(ontology)
-                recipes, total = service.get_recipes(validated_filters, page, per_page)
+                recipes, total = search_recipes_sync(
+                    tuple(sorted(validated_filters.items())), page, per_page
+                )
 
                 logger.warning(
                     "Celery submission failed; returning synchronous results as fallback"
@@ -189,7 +241,7 @@ def get_recipes():
 
 
     except Exception as e:
-        logger.error(f"Error processing recipe request: {str(e)}", exc_info=True)
+        logger.error("Error processing recipe request: %s", e, exc_info=True)
         return internal_error_response(
             "An error occurred while processing your request"
         )
@@ -200,23 +252,25 @@ def get_recipes_task_status(task_id):
     Check status of an asynchronous recipe search task.
     """
     result = AsyncResult(task_id, app=celery)
+    # Each .state access of an unfinished task is a backend round trip
+    state = result.state
 
     # Task still waiting
-    if result.state == "PENDING":
+    if state == "PENDING":
         return success_response(
             data={"state": "PENDING", "task_id": task_id},
             message="Task is pending"
         )
 
     # Task working
-    if result.state in ("STARTED", "RETRY"):
+    if state in ("STARTED", "RETRY"):
         return success_response(
-            data={"state": result.state, "task_id": task_id},
+            data={"state": state, "task_id": task_id},
             message="Task is in progress"
         )
 
     # Completed successfully
-    if result.state == "SUCCESS":
+    if state == "SUCCESS":
         payload = result.result or {}
         recipes = payload.get("recipes", [])
         page = payload.get("page", 1)
@@ -231,16 +285,14 @@ def get_recipes_task_status(task_id):
         )
 
     # Task failed
-    # Task failed
-    if result.state == "FAILURE":
+    if state == "FAILURE":
         exc = result.info  # wyjątek z zadania Celery
         error_message = str(exc) if exc else "Unknown error"
         error_type = type(exc).__name__ if exc else "UnknownException"
 
         # specjalne potraktowanie timeoutów
         is_timeout = isinstance(exc, (CeleryTimeoutError, SoftTimeLimitExceeded)) \
-                     or "TimeLimitExceeded" in error_type \
-                     or "Timeout" in error_type
+                     or error_type in TIMEOUT_ERROR_TYPES
 
         if is_timeout:
             # FEIN-69: osobny komunikat dla timeoutów
@@ -253,23 +305,49 @@ def get_recipes_task_status(task_id):
             f"Recipe search task failed: {error_message}"
         )
 
-
-
     # Fallback
     return success_response(
-        data={"state": result.state},
+        data={"state": state},
         message="Unknown task state"
     )
 
+def _reject_recipe_body():
+    """
+    Check the cheap preconditions of a recipe body before it is parsed.
+
+    Returns:
+        Error response for oversized or non-JSON bodies, or None if the body
+        may be parsed
+    """
+    max_bytes = current_app.config["MAX_RECIPE_BODY_BYTES"]
+    if request.content_length is not None and request.content_length > max_bytes:
+        return error_response(
+            f"Recipe body must not exceed {max_bytes} bytes",
+            code="PAYLOAD_TOO_LARGE",
+            status_code=413
+        )
+
+    # Reject non-JSON bodies without running the parser
+    if not request.is_json:
+        return validation_error_response({"body": ["Content-Type must be application/json"]})
+
+    return None
+
+
 @api_bp.route("/recipes", methods=["POST"])
 def create_recipe():
     """
     Create a new recipe asynchronously.
     Expected JSON: { "title": "My Cake", "instructions": "...", ... }
     """
-    data = request.get_json()
-    if not data or "title" not in data:
-        return validation_error_response(["Title is required"])
+    rejection = _reject_recipe_body()
+    if rejection is not None:
+        return rejection
+
+    try:
+        data = validate_recipe_payload(request.get_json(silent=True))
+    except ValidationError as e:
+        return validation_error_response(e.errors)
 
     # Trigger Celery Task
     task = create_recipe_async.delay(data)
@@ -299,9 +377,14 @@ def update_recipe(recipe_slug):
     """
     Update a recipe by its slug.
     """
-    data = request.get_json()
-    if not data or "title" not in data:
-        return validation_error_response(["Title is required"])
+    rejection = _reject_recipe_body()
+    if rejection is not None:
+        return rejection
+
+    try:
+        data = validate_recipe_payload(request.get_json(silent=True))
+    except ValidationError as e:
+        return validation_error_response(e.errors)
 
     # Trigger Celery Task
     task = update_recipe_async.delay(recipe_slug, data)
@@ -5,11 +5,26 @@ This module constructs SPARQL queries dynamically based on filter parameters,
 supporting nutritional values, dietary restrictions, ingredients, and more.
 """
 
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Ingredient filters containing any of these are matched as regular expressions
+_REGEX_META_RE = re.compile(r"[.^$*+?()\[\]{}|\\]")
+
+
+def _is_plain(ingredient: str) -> bool:
+    """
+    Check whether an ingredient filter can use the CONTAINS/LCASE fast path.
+
+    SQLite's LCASE only lowercases ASCII, so non-ASCII names go through the
+    case-insensitive regex like names with regex syntax do.
+    """
+    return ingredient.isascii() and _REGEX_META_RE.search(ingredient) is None
+
 
 class RecipeQueryBuilder:
     """Builder class for constructing SPARQL queries for recipe filtering."""
@@ -21,29 +36,38 @@ class RecipeQueryBuilder:
             "PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> "
             "PREFIX feinschmecker: <https://jaron.sprute.com/uni/actionable-knowledge-representation/feinschmecker/> "
         )
-        self.header = ""
-        self.body = ""
+        # Query pieces, joined once at the end instead of concatenated step by step
+        self.header_parts = []
+        self.body_parts = []
         self.filters = {}
     
     def build_query(self, filters: Dict[str, Any], limit: Optional[int] = None, offset: Optional[int] = None) -> str:
         """
         Build a complete SPARQL query from filter parameters.
-        """
-        self.filters = filters
-        self._build_header()
-        self._build_body()
         
-        query = self.header + " " + self.body
+        Filter values are not part of the text: the query refers to them as
+        numbered ``??n`` parameters, to be passed along from
+        build_query_params. The text is built once per filter shape (which
+        filters are set, how many ingredients) and cached.
+        """
+        query = _query_template(_shape_key(filters))
         
-        # Add LIMIT and OFFSET for pagination
+        # Pagination values are validated integers
         if limit is not None:
-            query += f" LIMIT {limit}"
+            query += f" LIMIT {int(limit)}"
         if offset is not None:
-            query += f" OFFSET {offset}"
+            query += f" OFFSET {int(offset)}"
         
-        logger.debug(f"Built SPARQL query: {query}")
+        logger.debug("Built SPARQL query: %s", query)
         return query
     
+    def _render(self, filters: Dict[str, Any]) -> str:
+        """Assemble the query text for the given placeholder filters."""
+        self.filters = filters
+        self._build_header()
+        self._build_body()
+        return "".join(self.header_parts) + " " + "".join(self.body_parts)
+    
     def _build_header(self):
         """Build the SELECT clause of the query including PREFIXES."""
         # Use the prefixes defined in __init__
@@ -52,11 +76,11 @@ class RecipeQueryBuilder:
             "(GROUP_CONCAT(?ing_name ; separator = \"#\" ) AS ?ingredients) "
             "?vegan ?vegetarian ?type_name ?time_amount ?difficulty_amount "
         )
-        self.header = self.prefixes + select_clause
+        self.header_parts = [self.prefixes, select_clause]
     
-    def _build_body(self):
-        """Build the WHERE clause and filters of the query."""
-        self.body = "{?res rdf:type feinschmecker:Recipe . \n"
+    def _build_body(self, grouped: bool = True):
+        """Build the WHERE clause and filters of the query, optionally with GROUP BY."""
+        self.body_parts = ["{?res rdf:type feinschmecker:Recipe . \n"]
         
         # Add ingredient filters
         if "ingredients" in self.filters:
@@ -77,50 +101,60 @@ class RecipeQueryBuilder:
         # Add required fields
         self._add_required_fields()
         
-        self.body += "}"
-        self.body += self._build_group_by()
+        self.body_parts.append("}")
+        if grouped:
+            self.body_parts.append(self._build_group_by())
     
     def _add_ingredient_filters(self, ingredients: list):
+        """
+        Require one ingredient per (value, plain) pair.
+        
+        Plain ASCII names are matched case-insensitively as substrings with
+        CONTAINS/LCASE, which run as native SQLite functions; their parameter
+        is lowercased in build_query_params. Names with regex syntax or
+        non-ASCII characters go through the much slower regex match.
+        """
         appendum = "a"
-        for i, ingredient in enumerate(ingredients):
-            self.body += f"?res feinschmecker:has_ingredient ?ext_ing{appendum} . \n"
-            self.body += f"?ext_ing{appendum} feinschmecker:type_of_ingredient ?ing{appendum} . \n"
-            self.body += f"?ing{appendum} feinschmecker:has_ingredient_name ?ing_name{appendum} . \n"
-            self.body += f"FILTER regex(?ing_name{appendum}, \"{ingredient}\", \"i\") . \n"
+        for ingredient, plain in ingredients:
+            self.body_parts.append(f"?res feinschmecker:has_ingredient ?ext_ing{appendum} . \n")
+            self.body_parts.append(f"?ext_ing{appendum} feinschmecker:type_of_ingredient ?ing{appendum} . \n")
+            self.body_parts.append(f"?ing{appendum} feinschmecker:has_ingredient_name ?ing_name{appendum} . \n")
+            if plain:
+                self.body_parts.append(f"FILTER CONTAINS(LCASE(?ing_name{appendum}), {ingredient}) . \n")
+            else:
+                self.body_parts.append(f"FILTER regex(?ing_name{appendum}, {ingredient}, \"i\") . \n")
             appendum += "a"
     
     def _add_dietary_filters(self):
         if "vegan" in self.filters:
-            vegan_value = "true" if self.filters["vegan"] else "false"
-            self.body += f"?res feinschmecker:is_vegan {vegan_value} . \n"
-        self.body += "?res feinschmecker:is_vegan ?vegan . \n"
+            self.body_parts.append(f"?res feinschmecker:is_vegan {self.filters['vegan']} . \n")
+        self.body_parts.append("?res feinschmecker:is_vegan ?vegan . \n")
         
         if "vegetarian" in self.filters:
-            vegetarian_value = "true" if self.filters["vegetarian"] else "false"
-            self.body += f"?res feinschmecker:is_vegetarian {vegetarian_value} . \n"
-        self.body += "?res feinschmecker:is_vegetarian ?vegetarian . \n"
+            self.body_parts.append(f"?res feinschmecker:is_vegetarian {self.filters['vegetarian']} . \n")
+        self.body_parts.append("?res feinschmecker:is_vegetarian ?vegetarian . \n")
     
     def _add_meal_type_filter(self):
         if "meal_type" in self.filters:
-            self.body += "?res feinschmecker:is_meal_type ?type . \n"
-            self.body += f"?type feinschmecker:has_meal_type_name \"{self.filters['meal_type']}\" . \n"
-            self.body += "?type feinschmecker:has_meal_type_name ?type_name . \n"
+            self.body_parts.append("?res feinschmecker:is_meal_type ?type . \n")
+            self.body_parts.append(f"?type feinschmecker:has_meal_type_name {self.filters['meal_type']} . \n")
+            self.body_parts.append("?type feinschmecker:has_meal_type_name ?type_name . \n")
         else:
-            self.body += "OPTIONAL {?res feinschmecker:is_meal_type ?type . \n"
-            self.body += "   ?type feinschmecker:has_meal_type_name ?type_name}. \n"
+            self.body_parts.append("OPTIONAL {?res feinschmecker:is_meal_type ?type . \n")
+            self.body_parts.append("   ?type feinschmecker:has_meal_type_name ?type_name}. \n")
     
     def _add_time_difficulty_filters(self):
         # Time filter
-        self.body += "?res feinschmecker:requires_time ?time . \n"
-        self.body += "?time feinschmecker:amount_of_time ?time_amount . \n"
+        self.body_parts.append("?res feinschmecker:requires_time ?time . \n")
+        self.body_parts.append("?time feinschmecker:amount_of_time ?time_amount . \n")
         if "time" in self.filters:
-            self.body += f"FILTER (?time_amount < {self.filters['time']}) . \n"
+            self.body_parts.append(f"FILTER (?time_amount < {self.filters['time']}) . \n")
         
         # Difficulty filter
-        self.body += "?res feinschmecker:has_difficulty ?difficulty . \n"
-        self.body += "?difficulty feinschmecker:has_numeric_difficulty ?difficulty_amount . \n"
+        self.body_parts.append("?res feinschmecker:has_difficulty ?difficulty . \n")
+        self.body_parts.append("?difficulty feinschmecker:has_numeric_difficulty ?difficulty_amount . \n")
         if "difficulty" in self.filters:
-            self.body += f"FILTER (?difficulty_amount = {self.filters['difficulty']}) . \n"
+            self.body_parts.append(f"FILTER (?difficulty_amount = {self.filters['difficulty']}) . \n")
     
     def _add_nutrient_filters(self):
         nutrients = ['calories', 'protein', 'fat', 'carbohydrates']
@@ -128,9 +162,9 @@ class RecipeQueryBuilder:
             self._add_nutrient_filter(nutrient)
     
     def _add_nutrient_filter(self, nutrient: str):
-        self.header += f"?{nutrient}_amount "
-        self.body += f"?res feinschmecker:has_{nutrient} ?{nutrient} . \n"
-        self.body += f"?{nutrient} feinschmecker:amount_of_{nutrient} ?{nutrient}_amount . \n"
+        self.header_parts.append(f"?{nutrient}_amount ")
+        self.body_parts.append(f"?res feinschmecker:has_{nutrient} ?{nutrient} . \n")
+        self.body_parts.append(f"?{nutrient} feinschmecker:amount_of_{nutrient} ?{nutrient}_amount . \n")
         
         # Support both old naming (bigger/smaller) and new naming (min/max)
         bigger_key = f"{nutrient}_bigger"
@@ -138,33 +172,33 @@ class RecipeQueryBuilder:
         smaller_key = f"{nutrient}_smaller"
         max_key = f"{nutrient}_max"
         
-        # Min/bigger filter
-        if bigger_key in self.filters:
-            self.body += f"FILTER (?{nutrient}_amount > {self.filters[bigger_key]}) . \n"
-        elif min_key in self.filters:
-            self.body += f"FILTER (?{nutrient}_amount > {self.filters[min_key]}) . \n"
+        lower = self.filters.get(bigger_key, self.filters.get(min_key))
+        upper = self.filters.get(smaller_key, self.filters.get(max_key))
         
-        # Max/smaller filter
-        if smaller_key in self.filters:
-            self.body += f"FILTER (?{nutrient}_amount < {self.filters[smaller_key]}) . \n"
-        elif max_key in self.filters:
-            self.body += f"FILTER (?{nutrient}_amount < {self.filters[max_key]}) . \n"
+        # A range becomes one FILTER, so the engine evaluates a single expression
+        conditions = []
+        if lower is not None:
+            conditions.append(f"?{nutrient}_amount > {lower}")
+        if upper is not None:
+            conditions.append(f"?{nutrient}_amount < {upper}")
+        if conditions:
+            self.body_parts.append(f"FILTER ({' && '.join(conditions)}) . \n")
     
     def _add_required_fields(self):
-        self.body += "?res feinschmecker:has_link ?link . \n"
-        self.body += "?res feinschmecker:has_image_link ?image_link . \n"
-        self.body += "?res feinschmecker:has_recipe_name ?name . \n"
-        self.body += "?res feinschmecker:has_instructions ?instructions . \n"
-        self.body += "?res feinschmecker:has_ingredient ?ing . \n"
-        self.body += "?ing feinschmecker:has_ingredient_with_amount_name ?ing_name . \n"
+        self.body_parts.append("?res feinschmecker:has_link ?link . \n")
+        self.body_parts.append("?res feinschmecker:has_image_link ?image_link . \n")
+        self.body_parts.append("?res feinschmecker:has_recipe_name ?name . \n")
+        self.body_parts.append("?res feinschmecker:has_instructions ?instructions . \n")
+        self.body_parts.append("?res feinschmecker:has_ingredient ?ing . \n")
+        self.body_parts.append("?ing feinschmecker:has_ingredient_with_amount_name ?ing_name . \n")
         
         # Author and source information
-        self.header += " ?author_name ?source_name ?source_link"
-        self.body += "?res feinschmecker:authored_by ?author . \n"
-        self.body += "?author feinschmecker:has_author_name ?author_name . \n"
-        self.body += "?author feinschmecker:is_author_of ?source . \n"
-        self.body += "?source feinschmecker:has_source_name ?source_name . \n"
-        self.body += "?source feinschmecker:is_website ?source_link . \n"
+        self.header_parts.append(" ?author_name ?source_name ?source_link")
+        self.body_parts.append("?res feinschmecker:authored_by ?author . \n")
+        self.body_parts.append("?author feinschmecker:has_author_name ?author_name . \n")
+        self.body_parts.append("?author feinschmecker:is_author_of ?source . \n")
+        self.body_parts.append("?source feinschmecker:has_source_name ?source_name . \n")
+        self.body_parts.append("?source feinschmecker:is_website ?source_link . \n")
     
     def _build_group_by(self) -> str:
         return (
@@ -175,10 +209,101 @@ class RecipeQueryBuilder:
         )
 
 
+def _shape_key(filters: Dict[str, Any]) -> Tuple:
+    """
+    Get the part of a search that determines the query text.
+    
+    Args:
+        filters: Validated filter parameters
+    
+    Returns:
+        Hashable key identifying the query template
+    """
+    ingredients = tuple(_is_plain(ingredient) for ingredient in filters.get("ingredients") or ())
+    return tuple(sorted(filters)), ingredients
+
+
+def build_query_params(filters: Dict[str, Any]) -> List[Any]:
+    """
+    Get the parameter values for the ``??n`` placeholders of a query.
+    
+    The order matches _placeholders: filter keys sorted by name, with one
+    parameter per ingredient. Search and count queries share the list.
+    
+    Args:
+        filters: Validated filter parameters
+    
+    Returns:
+        List of parameter values, the first one being ``??1``
+    """
+    params = []
+    for key in sorted(filters):
+        if key == "ingredients":
+            params.extend(
+                ingredient.lower() if _is_plain(ingredient) else ingredient
+                for ingredient in filters[key]
+            )
+        else:
+            params.append(filters[key])
+    return params
+
+
+def _placeholders(shape: Tuple) -> Dict[str, Any]:
+    """Build stand-in filters whose values are numbered SPARQL parameters."""
+    keys, ingredients = shape
+    placeholders = {}
+    number = 1
+    for key in keys:
+        if key == "ingredients":
+            placeholders[key] = [(f"??{number + i}", plain) for i, plain in enumerate(ingredients)]
+            number += len(ingredients)
+        else:
+            placeholders[key] = f"??{number}"
+            number += 1
+    return placeholders
+
+
+@lru_cache(maxsize=256)
+def _query_template(shape: Tuple) -> str:
+    """
+    Build the search query text for one filter shape.
+    
+    Args:
+        shape: Key returned by _shape_key
+    
+    Returns:
+        Query text without LIMIT/OFFSET, using ``??n`` parameters
+    """
+    return RecipeQueryBuilder()._render(_placeholders(shape))
+
+
+@lru_cache(maxsize=256)
+def _count_template(shape: Tuple) -> str:
+    """
+    Build the count query text for one filter shape.
+    
+    Args:
+        shape: Key returned by _shape_key
+    
+    Returns:
+        Query text using ``??n`` parameters
+    """
+    return _render_count_query(_placeholders(shape))
+
+
 def build_count_query(filters: Dict[str, Any]) -> str:
     """
     Build a SPARQL query to count total matching recipes (for pagination).
+    
+    Like build_query, the filter values are passed separately as parameters.
     """
+    query = _count_template(_shape_key(filters))
+    logger.debug("Built count query: %s", query)
+    return query
+
+
+def _render_count_query(filters: Dict[str, Any]) -> str:
+    """Assemble the count query text for the given filters, which may be placeholders."""
     # Build a query similar to the main query but only count results
     builder = RecipeQueryBuilder()
     builder.filters = filters
@@ -188,11 +313,6 @@ def build_count_query(filters: Dict[str, Any]) -> str:
     count_header = builder.prefixes + "SELECT (COUNT(DISTINCT ?res) AS ?count) "
     
     # Build body without grouping
-    builder._build_body()
-    
-    # Remove the GROUP BY clause from the body
-    body = builder.body.split("GROUP BY")[0]
+    builder._build_body(grouped=False)
     
-    query = count_header + body
-    logger.debug(f"Built count query: {query}")
-    return query
\ No newline at end of file
+    return count_header + "".join(builder.body_parts)
\ No newline at end of file
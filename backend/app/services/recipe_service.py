@@ -7,25 +7,163 @@ and interaction with the ontology.
 
 import logging
 import time
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Tuple
 from owlready2 import default_world
 
-from backend.app.services.query_builder import RecipeQueryBuilder, build_count_query
+from backend.app.services.query_builder import RecipeQueryBuilder, build_count_query, build_query_params
 
 logger = logging.getLogger(__name__)
 
+# Result columns of the search query, in SELECT order
+FIELD_ORDER = (
+    "name", "link", "image_link", "instructions", "ingredients",
+    "vegan", "vegetarian", "meal_type", "time", "difficulty",
+    "calories", "protein", "fat", "carbohydrates",
+    "author", "source_name", "source_link",
+)
+
+
+# Size of the instruction/ingredient parse caches. Cached results are shared
+# between recipes and pages, so they are returned as immutable tuples
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_instruction_steps(instructions_str: str) -> Tuple[str, ...]:
+    """
+    Parse instructions from their string representation.
+    
+    Args:
+        instructions_str: String representation of instructions list
+    
+    Returns:
+        Tuple of instruction steps
+    """
+    # Remove outer brackets and quotes
+    cleaned = instructions_str.strip("[]'\"")
+    
+    # Split by delimiter
+    steps = cleaned.split("', '")
+    
+    # Clean up each step
+    cleaned_steps = []
+    for step in steps:
+        # Remove "step X" prefix and leading digits
+        step = step.lstrip("step ").lstrip("0123456789").strip()
+        if step:
+            cleaned_steps.append(step)
+    
+    return tuple(cleaned_steps)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _split_hash(ingredients_str: str) -> Tuple[str, ...]:
+    """Split '#'-joined ingredient names into a tuple."""
+    return tuple(ingredients_str.split('#'))
+
+
+def _parse_instructions(value: Any) -> Any:
+    """Parse an instructions column; non-string values are kept as they are."""
+    if isinstance(value, str):
+        return _parse_instruction_steps(value)
+    return value
+
+
+_TRUE_STRINGS = frozenset(('true', '1', 'yes'))
+
+
+def _parse_boolean(value: Any) -> bool:
+    """
+    Parse a value into a boolean.
+    
+    Args:
+        value: Value to parse
+    
+    Returns:
+        Boolean value
+    """
+    # Owlready2 returns typed literals, so the exact-type check is the common path
+    if value.__class__ is bool:
+        return value
+    if isinstance(value, str):
+        return value.lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _parse_number(value: Any) -> float:
+    """
+    Parse a value into a number.
+    
+    Args:
+        value: Value to parse
+    
+    Returns:
+        Numeric value
+    """
+    if value.__class__ is float:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _split_ingredients(value: Any) -> Any:
+    """Split the ingredients column; non-string values are kept as they are."""
+    if isinstance(value, str):
+        return _split_hash(value)
+    return value
+
+
+# Conversion applied to each result column; other columns are passed through
+_COLUMN_PARSERS = {
+    "instructions": _parse_instructions,
+    "ingredients": _split_ingredients,
+    "vegan": _parse_boolean,
+    "vegetarian": _parse_boolean,
+    "time": _parse_number,
+    "difficulty": _parse_number,
+    "calories": _parse_number,
+    "protein": _parse_number,
+    "fat": _parse_number,
+    "carbohydrates": _parse_number,
+}
+_COLUMNS = tuple((field, _COLUMN_PARSERS.get(field)) for field in FIELD_ORDER)
+
+
+# Total counts per (count query, parameters), valid for one ontology version
+_count_cache = {}
+_count_cache_version = None
+COUNT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=512)
+def _prepare(query: str):
+    """
+    Parse a SPARQL query once and keep the prepared form.
+    
+    Queries only differ per filter shape and page, with the filter values
+    passed as parameters, so repeated searches skip owlready2's parser.
+    """
+    return default_world.prepare_sparql(query)
+
 
 class RecipeService:
     """Service class for recipe operations."""
     
-    def __init__(self, ontology):
+    def __init__(self, ontology, version=None):
         """
         Initialize the recipe service.
         
         Args:
             ontology: Loaded ontology instance
+            version: Identifier that changes whenever the ontology contents
+                change. If given, total counts are reused across pages and
+                requests until it changes.
         """
         self.ontology = ontology
+        self.version = version
         self.query_builder = RecipeQueryBuilder()
     
     def get_recipes(
@@ -45,13 +183,16 @@ class RecipeService:
         Returns:
             Tuple of (list of recipe dictionaries, total count)
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Calculate pagination offset
         offset = (page - 1) * per_page
         
+        # Filter values are bound as parameters of both queries
+        params = build_query_params(filters)
+        
         # Get total count (for pagination metadata)
-        total_count = self._get_total_count(filters)
+        total_count = self._get_total_count(filters, params)
         logger.info(f"Found {total_count} total recipes matching filters")
         
         # Build and execute main query
@@ -59,15 +200,13 @@ class RecipeService:
         
         try:
             with self.ontology:
-                recipe_list = list(default_world.sparql(query))
+                # Rows are transformed as they are read from the query
+                recipes = self._transform_results(_prepare(query).execute(params))
         except Exception as e:
             logger.error(f"SPARQL query failed: {str(e)}")
             raise
         
-        # Transform results to dictionaries
-        recipes = self._transform_results(recipe_list)
-        
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         logger.info(f"Retrieved {len(recipes)} recipes in {elapsed_time:.3f}s")
         
         if elapsed_time > 1.0:
@@ -75,152 +214,61 @@ class RecipeService:
         
         return recipes, total_count
     
-    def _get_total_count(self, filters: Dict[str, Any]) -> int:
+    def _get_total_count(self, filters: Dict[str, Any], params: List[Any]) -> int:
         """
         Get the total count of recipes matching the filters.
         
         Args:
             filters: Dictionary of filter parameters
+            params: Query parameters from build_query_params
         
         Returns:
             Total number of matching recipes
         """
+        global _count_cache_version
         count_query = build_count_query(filters)
         
+        key = (count_query, tuple(params))
+        if self.version is not None:
+            if _count_cache_version != self.version:
+                _count_cache.clear()
+                _count_cache_version = self.version
+            cached = _count_cache.get(key)
+            if cached is not None:
+                return cached
+        
         try:
             with self.ontology:
-                result = list(default_world.sparql(count_query))
-                if result and len(result) > 0:
-                    return int(result[0][0])
-                return 0
+                # Only the first row is needed, so don't materialize the result
+                row = next(iter(_prepare(count_query).execute(params)), None)
+                count = int(row[0]) if row else 0
         except Exception as e:
             logger.error(f"Count query failed: {str(e)}")
             # Fall back to returning 0 if count fails
             return 0
+        
+        if self.version is not None and len(_count_cache) < COUNT_CACHE_SIZE:
+            _count_cache[key] = count
+        return count
     
-    def _transform_results(self, recipe_list: List[tuple]) -> List[Dict[str, Any]]:
+    def _transform_results(self, recipe_rows: Iterable[tuple]) -> List[Dict[str, Any]]:
         """
         Transform SPARQL query results into recipe dictionaries.
         
+        Each row is mapped and converted in a single pass, so the result
+        iterator can be consumed directly without an intermediate list.
+        
         Args:
-            recipe_list: List of tuples from SPARQL query
+            recipe_rows: Iterable of tuples from the SPARQL query
         
         Returns:
             List of recipe dictionaries with proper types
         """
-        field_order = [
-            "name", "link", "image_link", "instructions", "ingredients",
-            "vegan", "vegetarian", "meal_type", "time", "difficulty",
-            "calories", "protein", "fat", "carbohydrates",
-            "author", "source_name", "source_link"
-        ]
-        
         recipes = []
-        for result in recipe_list:
-            recipe = {}
-            
-            # Map result tuple to dictionary
-            for i, field in enumerate(field_order):
-                if i < len(result):
-                    recipe[field] = result[i]
-            
-            # Transform data types and formats
-            recipe = self._normalize_recipe(recipe)
-            
-            recipes.append(recipe)
-        
+        for row in recipe_rows:
+            # Rows shorter than FIELD_ORDER simply leave the trailing fields out
+            recipes.append({
+                field: value if parse is None else parse(value)
+                for (field, parse), value in zip(_COLUMNS, row)
+            })
         return recipes
-    
-    def _normalize_recipe(self, recipe: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Normalize recipe data types and formats.
-        
-        Args:
-            recipe: Raw recipe dictionary from SPARQL
-        
-        Returns:
-            Normalized recipe dictionary
-        """
-        # Parse instructions from string representation of list
-        if 'instructions' in recipe and isinstance(recipe['instructions'], str):
-            recipe['instructions'] = self._parse_instructions(recipe['instructions'])
-        
-        # Parse ingredients from concatenated string
-        if 'ingredients' in recipe and isinstance(recipe['ingredients'], str):
-            recipe['ingredients'] = recipe['ingredients'].split('#')
-        
-        # Convert boolean strings to actual booleans
-        for bool_field in ['vegan', 'vegetarian']:
-            if bool_field in recipe:
-                recipe[bool_field] = self._parse_boolean(recipe[bool_field])
-        
-        # Convert numeric fields to proper types
-        if 'time' in recipe:
-            recipe['time'] = self._parse_number(recipe['time'])
-        
-        if 'difficulty' in recipe:
-            recipe['difficulty'] = self._parse_number(recipe['difficulty'])
-        
-        for nutrient in ['calories', 'protein', 'fat', 'carbohydrates']:
-            if nutrient in recipe:
-                recipe[nutrient] = self._parse_number(recipe[nutrient])
-        
-        return recipe
-    
-    def _parse_instructions(self, instructions_str: str) -> List[str]:
-        """
-        Parse instructions from string representation.
-        
-        Args:
-            instructions_str: String representation of instructions list
-        
-        Returns:
-            List of instruction steps
-        """
-        # Remove outer brackets and quotes
-        cleaned = instructions_str.strip("[]'\"")
-        
-        # Split by delimiter
-        steps = cleaned.split("', '")
-        
-        # Clean up each step
-        cleaned_steps = []
-        for step in steps:
-            # Remove "step X" prefix and leading digits
-            step = step.lstrip("step ").lstrip("0123456789").strip()
-            if step:
-                cleaned_steps.append(step)
-        
-        return cleaned_steps
-    
-    def _parse_boolean(self, value: Any) -> bool:
-        """
-        Parse a value into a boolean.
-        
-        Args:
-            value: Value to parse
-        
-        Returns:
-            Boolean value
-        """
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return value.lower() in ('true', '1', 'yes')
-        return bool(value)
-    
-    def _parse_number(self, value: Any) -> float:
-        """
-        Parse a value into a number.
-        
-        Args:
-            value: Value to parse
-        
-        Returns:
-            Numeric value
-        """
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-
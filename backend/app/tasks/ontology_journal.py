@@ -0,0 +1,127 @@
+"""
+Append-only journal of recipe changes next to the local ontology file.
+
+Instead of rewriting the whole N-Triples file after every create, update or
+delete, workers append one JSON line describing the change. Other workers
+replay the lines they have not seen yet, and the journal is periodically
+compacted back into the N-Triples file.
+
+The first line of the journal holds its generation. Compaction starts a new
+generation, which tells the other workers to reload the base file.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from backend.app.utils.file_lock import file_lock
+
+
+class OntologyJournal:
+    """Journal file belonging to one local ontology file."""
+
+    def __init__(self, ontology_path):
+        """
+        Args:
+            ontology_path: Path of the local N-Triples ontology file
+        """
+        self.ontology_path = Path(ontology_path)
+        self.path = Path(f"{ontology_path}.journal")
+        self.lock_path = Path(f"{ontology_path}.lock")
+
+    def lock(self):
+        """
+        Lock the journal and the ontology file against other processes.
+
+        Returns:
+            Context manager holding the lock
+        """
+        return file_lock(self.lock_path)
+
+    def generation(self):
+        """
+        Get the generation of the journal on disk.
+
+        Returns:
+            Generation string, or None if there is no valid journal
+        """
+        try:
+            with open(self.path, "rb") as f:
+                return json.loads(f.readline())["generation"]
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    def reset(self):
+        """
+        Start a new, empty generation. Call with the lock held.
+
+        Returns:
+            Tuple of (generation, offset just after the header)
+        """
+        generation = str(time.time_ns())
+        header = (json.dumps({"generation": generation}) + "\n").encode()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return generation, len(header)
+
+    def read_since(self, generation, offset):
+        """
+        Read the entries appended after a known position. Call with the lock held.
+
+        Args:
+            generation: Generation the caller has applied, or None
+            offset: Byte offset up to which the caller has applied entries
+
+        Returns:
+            Tuple of (entries, new offset, current generation, reset) where
+            reset is True if the generation changed and the caller has to
+            reload the base file before applying the entries
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return [], 0, None, generation is not None
+
+        with f:
+            header = f.readline()
+            try:
+                current = json.loads(header)["generation"]
+            except (ValueError, KeyError, TypeError):
+                return [], 0, None, generation is not None
+
+            reset = current != generation
+            if reset or offset < len(header):
+                offset = len(header)
+            f.seek(offset)
+
+            entries = []
+            for line in f:
+                # A line without newline is still being written
+                if not line.endswith(b"\n"):
+                    break
+                entries.append(json.loads(line))
+                offset += len(line)
+
+        return entries, offset, current, reset
+
+    def append(self, entry):
+        """
+        Append one entry durably. Call with the lock held.
+
+        Args:
+            entry: JSON-serializable description of the change
+
+        Returns:
+            Byte offset just after the new entry
+        """
+        line = (json.dumps(entry) + "\n").encode()
+        with open(self.path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
@@ -6,7 +6,12 @@ This module moves the expensive ontology/SPARQL queries to background
 Celery workers.
 """
 
+import contextlib
 import logging
+from hashlib import blake2b
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 import time
 from owlready2 import get_ontology
@@ -14,10 +19,14 @@ from urllib.request import urlopen
 from urllib.parse import urlparse, unquote
 from pathlib import Path
 from celery.exceptions import SoftTimeLimitExceeded
-from backend.celery_config import celery
+from celery.signals import worker_init
+import orjson
+import redis
+from backend.celery_config import celery, REDIS_URL
 from backend.config import get_config
 from backend.app.services.recipe_service import RecipeService
-from ontology.individuals import create_single_recipe, delete_recipe_individual
+from backend.app.tasks.ontology_journal import OntologyJournal
+from ontology.individuals import create_single_recipe, delete_recipe_individual, clear_individual_caches
 import os
 from ontology.individuals import onthologifyName
 
@@ -29,6 +38,339 @@ _ontology_version = None
 _ontology_uri_cached = None
 _ontology_mtime = None
 
+# Klucze Redis, przez które workery ogłaszają sobie nową wersję ontologii
+ONTOLOGY_VERSION_KEY = "feinschmecker:ontology_version"
+ONTOLOGY_LOCAL_KEY = "feinschmecker:ontology_local"
+ONTOLOGY_READY_KEY = "feinschmecker:ontology_ready"
+# Prefix of cached search results; keys also carry the ontology version
+SEARCH_CACHE_PREFIX = "feinschmecker:search:"
+
+# Write buffer for full ontology saves; keeps write() calls few for multi-MB files
+SAVE_BUFFER_SIZE = 1 << 20
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+# Dziennik zmian: pozycja, do której zmiany są już w pamięci tego procesu
+_journal = None
+_journal_generation = None
+_journal_offset = 0
+_journal_entries = 0
+
+# Kompaktowanie dziennika odbywa się w tle, po jednym naraz
+_compact_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ontology-compact")
+_compaction_pending = False
+_ontology_lock = threading.Lock()
+
+
+def _get_redis():
+    """
+    Return the module-level Redis client, creating it on first use.
+
+    The compaction thread publishes too, so creation is guarded by a lock;
+    the client's connection pool is thread-safe afterwards.
+
+    Returns:
+        Redis client shared by all tasks in this process
+    """
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = redis.from_url(REDIS_URL, socket_keepalive=True)
+    return _redis_client
+
+
+def _get_journal():
+    """
+    Return the journal of the local ontology file, creating it on first use.
+
+    ONTOLOGY_PATH is resolved to an absolute path here, once per process, and
+    everything else takes the file location from journal.ontology_path.
+
+    Returns:
+        OntologyJournal shared by all tasks in this process
+    """
+    global _journal
+    if _journal is None:
+        config = get_config()
+        _journal = OntologyJournal(Path(config.ONTOLOGY_PATH).resolve())
+    return _journal
+
+
+def _set_journal_position(generation, offset):
+    """
+    Remember up to where the journal has been applied in memory.
+
+    Without a journal generation the state is not identified by any version,
+    so _ontology_version stays None and nothing is cached against it.
+    """
+    global _journal_generation, _journal_offset, _ontology_version
+    _journal_generation = generation
+    _journal_offset = offset
+    _ontology_version = f"{generation}:{offset}" if generation is not None else None
+
+
+def _publish_version_to_redis(version, local_path=None):
+    """
+    Announce a new ontology version to the other worker processes.
+
+    All keys are written with one atomic MSET, so subscribers never see a
+    version without its matching local file and the publish costs a single
+    command and round-trip.
+
+    Args:
+        version: Version string to publish
+        local_path: Path of the file the change was written to, if any
+
+    Returns:
+        The published version string, or None if Redis was unreachable
+    """
+    try:
+        mapping = {ONTOLOGY_VERSION_KEY: version, ONTOLOGY_READY_KEY: version}
+        if local_path:
+            mapping[ONTOLOGY_LOCAL_KEY] = str(local_path)
+        _get_redis().mset(mapping)
+    except redis.RedisError as exc:
+        logger.warning("[Celery] Could not publish ontology version: %s", exc)
+        return None
+    return version
+
+
+def _apply_entry(onto, entry):
+    """
+    Apply one journal entry to the ontology.
+
+    Args:
+        onto: Ontology to modify
+        entry: Journal entry as written by _commit_change
+
+    Returns:
+        True if the ontology changed
+    """
+    op = entry["op"]
+    if op == "create":
+        _, changed = create_single_recipe(entry["recipe"], target_kg=onto)
+        return changed
+    if op == "delete":
+        return delete_recipe_individual(entry["name"], target_kg=onto)
+    if op == "update":
+        recipe_data = entry["recipe"]
+        deleted = False
+        # If title changed, the ID changes, so delete the old one
+        if entry["old_slug"] != onthologifyName(recipe_data["title"]):
+            deleted = delete_recipe_individual(entry["old_slug"], target_kg=onto)
+        _, changed = create_single_recipe(recipe_data, target_kg=onto)
+        return deleted or changed
+    raise ValueError(f"Unknown journal operation: {op}")
+
+
+def _catch_up(onto):
+    """
+    Apply the journal entries other workers wrote since our last look.
+
+    Must be called with the ontology lock and the journal lock held. If the
+    journal was compacted in the meantime, the base file is reloaded first.
+    """
+    global _journal_entries
+    journal = _get_journal()
+    entries, offset, generation, reset = journal.read_since(_journal_generation, _journal_offset)
+
+    if reset:
+        file_path = journal.ontology_path
+        logger.info("[Celery] Ontology journal compacted, reloading %s", file_path)
+        with open(file_path, "rb") as fileobj:
+            onto.load(reload=True, fileobj=fileobj, format="ntriples")
+        clear_individual_caches()
+        _journal_entries = 0
+
+    if entries:
+        with onto:
+            for entry in entries:
+                _apply_entry(onto, entry)
+        _journal_entries += len(entries)
+
+    _set_journal_position(generation, offset)
+
+
+def _rebuild_from_journal(onto):
+    """
+    Reload the base file and replay the whole journal.
+
+    Drops changes that were applied in memory but never journaled. Must be
+    called with the ontology lock and the journal lock held.
+    """
+    global _journal_entries
+    journal = _get_journal()
+    with open(journal.ontology_path, "rb") as fileobj:
+        onto.load(reload=True, fileobj=fileobj, format="ntriples")
+    clear_individual_caches()
+    _journal_entries = 0
+    # Offset 0 makes _catch_up replay every entry of the current generation
+    _set_journal_position(journal.generation(), 0)
+    _catch_up(onto)
+
+
+def _commit_change(onto, entry):
+    """
+    Apply a change to the ontology and append it to the journal.
+
+    Only the small JSON entry is written per change; the N-Triples file is
+    rewritten by the background compaction every
+    ONTOLOGY_JOURNAL_COMPACT_EVERY entries. If the change cannot be
+    journaled, the ontology is rebuilt from disk so this worker does not keep
+    a change the others never see, and the error is re-raised.
+
+    Args:
+        onto: Ontology to modify
+        entry: JSON-serializable description of the change
+
+    Returns:
+        True if the ontology changed (unchanged entries are not journaled)
+    """
+    global _journal_entries, _compaction_pending
+    config = get_config()
+    journal = _get_journal()
+
+    with _ontology_lock, journal.lock():
+        _catch_up(onto)
+
+        try:
+            # Workers use owlready2's in-memory quadstore: all these writes share
+            # one implicit SQLite transaction and nothing is fsynced, so there is
+            # no per-triple commit to batch.
+            with onto:
+                changed = _apply_entry(onto, entry)
+            if not changed:
+                return False
+
+            if _journal_generation is None:
+                _set_journal_position(*journal.reset())
+            offset = journal.append(entry)
+        except Exception:
+            # No other worker will replay a change that is not in the journal,
+            # so it must not stay in this worker's memory either
+            logger.error("[Celery] Journaling a change failed, rebuilding the ontology from disk")
+            _rebuild_from_journal(onto)
+            raise
+        _set_journal_position(_journal_generation, offset)
+        _journal_entries += 1
+        _publish_version_to_redis(_ontology_version, journal.path)
+        # One compaction at a time; changes arriving meanwhile are folded into it
+        compact = (
+            _journal_entries >= config.ONTOLOGY_JOURNAL_COMPACT_EVERY
+            and not _compaction_pending
+        )
+        if compact:
+            _compaction_pending = True
+
+    if compact:
+        future = _compact_executor.submit(_compact_journal, onto)
+        future.add_done_callback(_log_compaction_failure)
+    return True
+
+
+def _compact_journal(onto):
+    """
+    Fold the journal back into the N-Triples file and start a new generation.
+
+    The file is written by _save_atomically, so other workers never read a
+    half-written file. Replaying entries is
+    idempotent, so a crash between the two steps loses nothing.
+
+    Waits ONTOLOGY_COMPACT_DELAY seconds first, so a burst of changes ends
+    up in a single full save.
+    """
+    global _journal_entries, _compaction_pending
+    config = get_config()
+    journal = _get_journal()
+    file_path = journal.ontology_path
+
+    time.sleep(config.ONTOLOGY_COMPACT_DELAY)
+    with _ontology_lock, journal.lock():
+        _compaction_pending = False
+        _catch_up(onto)
+        if _journal_entries < config.ONTOLOGY_JOURNAL_COMPACT_EVERY:
+            # Another worker compacted in the meantime
+            return
+
+        _save_atomically(onto, file_path)
+        _set_journal_position(*journal.reset())
+        _journal_entries = 0
+        _publish_version_to_redis(_ontology_version, file_path)
+
+    logger.info("[Celery] Compacted ontology journal into %s", file_path)
+
+
+def _save_atomically(onto, file_path):
+    """
+    Write the ontology as N-Triples and swap it in with os.replace.
+
+    The data goes through one large buffer and is fsynced before the rename,
+    so a crash leaves either the old or the complete new file on disk.
+
+    Args:
+        onto: Ontology to save
+        file_path: Target N-Triples file
+    """
+    file_path = Path(file_path)
+    tmp_name = None
+    try:
+        # A unique name in the target directory keeps os.replace atomic and
+        # leaves no fixed tmp path behind that a later save could trip over
+        with tempfile.NamedTemporaryFile(
+            dir=file_path.parent, prefix=file_path.name + ".", suffix=".part",
+            delete=False, buffering=SAVE_BUFFER_SIZE,
+        ) as f:
+            tmp_name = f.name
+            onto.save(file=f, format="ntriples")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, file_path)
+    except Exception:
+        # os.replace consumed the file on success, so only failures clean up
+        if tmp_name is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+        raise
+
+
+def _log_compaction_failure(future):
+    """Log errors of a background compaction, which would otherwise go unnoticed."""
+    exc = future.exception()
+    if exc is not None:
+        logger.error("[Celery] Compacting the ontology journal failed: %s", exc, exc_info=exc)
+
+
+def _read_published_version():
+    """
+    Read the ontology version last published by any worker.
+
+    Returns:
+        Version string, or None if nothing was published or Redis is down
+    """
+    try:
+        published = _get_redis().get(ONTOLOGY_VERSION_KEY)
+    except redis.RedisError as exc:
+        logger.warning("[Celery] Could not read ontology version: %s", exc)
+        return None
+    return published.decode() if published is not None else None
+
+
+def _refresh_if_stale():
+    """
+    Catch up with changes when another worker published a newer version.
+
+    Each prefork child keeps its own copy in memory, so changes made by a
+    sibling are only visible after replaying its journal entries.
+    """
+    published = _read_published_version()
+    if published is None or published == _ontology_version:
+        return
+
+    with _ontology_lock, _get_journal().lock():
+        _catch_up(_ontology)
+
 
 def _get_ontology_for_tasks():
     """
@@ -36,38 +378,104 @@ def _get_ontology_for_tasks():
     
     Every time the worker starts (App Reload), it will:
     1. Fetch the fresh base ontology from the URL (RDF/XML).
-    2. Overwrite the local .nt file (Factory Reset).
+    2. Overwrite the local .nt file and start an empty journal (Factory Reset).
     3. Load it into memory for the session.
     """
-    global _ontology
+    global _ontology, _journal_entries
     if _ontology is None:
         config = get_config()
-        file_path = config.ONTOLOGY_PATH
+        journal = _get_journal()
+        file_path = journal.ontology_path
         
         logger.info(f"[Celery] 🔄 FRESH START: Fetching base ontology from {config.ONTOLOGY_URL}")
         
         try:
             # 1. Always load from the Source URL first (ignoring local file)
             # This creates an in-memory ontology from the clean RDF source
-            _ontology = get_ontology(config.ONTOLOGY_URL).load()
+            ontology = get_ontology(config.ONTOLOGY_URL).load()
             
             # 2. Immediately overwrite the local 'database' file
             # This wipes any previous deletions/additions from the last session
             logger.info(f"[Celery] 💾 RESETTING local database at {file_path}")
-            _ontology.save(file=file_path, format="ntriples")
+            with _ontology_lock, journal.lock():
+                _save_atomically(ontology, file_path)
+                _set_journal_position(*journal.reset())
+                _journal_entries = 0
+                _publish_version_to_redis(_ontology_version, file_path)
+            _ontology = ontology
             
         except Exception as e:
             logger.error(f"[Celery] ⚠️ Failed to fetch remote ontology: {e}")
             # Fallback: If internet fails, try to load the local file if it exists
             if os.path.exists(file_path):
                 logger.warning("[Celery] Using existing local file as fallback.")
-                _ontology = get_ontology(f"file://{file_path}").load()
+                with _ontology_lock, journal.lock():
+                    ontology = get_ontology(f"file://{file_path}").load()
+                    _set_journal_position(journal.generation(), 0)
+                    _journal_entries = 0
+                    _catch_up(ontology)
+                _ontology = ontology
             else:
                 raise e
+    else:
+        _refresh_if_stale()
 
     return _ontology
 
 
+@worker_init.connect
+def _preload_ontology(**kwargs):
+    """
+    Parse the ontology once in the worker main process.
+
+    Prefork pool children inherit the parsed ontology through fork instead of
+    each one downloading, parsing and resetting the local file on its own.
+    """
+    try:
+        _get_ontology_for_tasks()
+    except Exception as exc:
+        # Children retry lazily on their first task
+        logger.error(f"[Celery] Ontology preload failed: {exc}")
+
+
+def _search_cache_key(version, filters, page, per_page):
+    """
+    Build the Redis key of a search result.
+
+    The key includes the ontology version, so any recipe change makes all
+    older results unreachable instead of serving them until they expire.
+
+    Args:
+        version: Ontology version the search runs against
+        filters: Validated filter parameters
+        page: Page number
+        per_page: Page size
+
+    Returns:
+        Redis key string
+    """
+    payload = orjson.dumps([sorted(filters.items()), page, per_page])
+    return f"{SEARCH_CACHE_PREFIX}{version}:{blake2b(payload, digest_size=16).hexdigest()}"
+
+
+def _get_cached_search(key):
+    """Return a cached search result, or None on a miss or Redis error."""
+    try:
+        cached = _get_redis().get(key)
+    except redis.RedisError as exc:
+        logger.warning("[Celery] Could not read search cache: %s", exc)
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+
+def _cache_search(key, result):
+    """Store a search result for SEARCH_CACHE_TIMEOUT seconds, ignoring Redis errors."""
+    try:
+        _get_redis().set(key, orjson.dumps(result), ex=get_config().SEARCH_CACHE_TIMEOUT)
+    except redis.RedisError as exc:
+        logger.warning("[Celery] Could not write search cache: %s", exc)
+
+
 # typy błędów, które traktujemy jako „chwilowe” i warto spróbować ponownie
 TRANSIENT_EXCEPTIONS = (
     TimeoutError,
@@ -129,21 +537,40 @@ def search_recipes_async(
             # Do not retry, as this is a configuration or file system issue.
             raise
 
-        service = RecipeService(ontology)
-
-        recipes, total_count = service.get_recipes(filters, page, per_page)
+        # The background compaction may reload the ontology and move the
+        # version at any time, so the version, the cache key and the query
+        # must all be taken under the same lock
+        with _ontology_lock:
+            version = _ontology_version
+            # Before a journal generation is known, workers cannot tell their
+            # states apart, so results are neither read from nor put in the cache
+            cache_key = None
+            if version is not None:
+                cache_key = _search_cache_key(version, filters, page, per_page)
+                cached = _get_cached_search(cache_key)
+                if cached is not None:
+                    logger.info("[Celery] Recipe search served from cache (task_id=%s)", self.request.id)
+                    return cached
+
+            # Counts stay valid until the next journal entry is applied
+            service = RecipeService(ontology, version=version)
+
+            recipes, total_count = service.get_recipes(filters, page, per_page)
 
         logger.info(
             "[Celery] Recipe search completed "
             f"(task_id={self.request.id}, total={total_count})"
         )
 
-        return {
+        result = {
             "recipes": recipes,
             "page": page,
             "per_page": per_page,
             "total": total_count,
         }
+        if cache_key is not None:
+            _cache_search(cache_key, result)
+        return result
 
     except TRANSIENT_EXCEPTIONS as exc:
         # FEIN-68 + FEIN-69: log i retry przy chwilowych problemach
@@ -184,23 +611,19 @@ def search_recipes_async(
 @celery.task(name="recipes.create_recipe", bind=True)
 def create_recipe_async(self, recipe_data: dict):
     """
-    Creates a new recipe and SAVES to the .nt file.
+    Creates a new recipe and records it in the ontology journal.
     """
     try:
-        logger.info(f"[Celery] Creating recipe: {recipe_data.get('title')}")
+        title = recipe_data.get("title")
+        logger.info(f"[Celery] Creating recipe: {title}")
         onto = _get_ontology_for_tasks()
-        config = get_config()
-
-        # 1. Modify the ontology in memory
-        with onto:
-            create_single_recipe(recipe_data, target_kg=onto)
 
-        # 2. Persist changes to disk
-        # This is the Critical Step for CRUD
-        onto.save(file=config.ONTOLOGY_PATH, format="ntriples")
-        logger.info(f"[Celery] Saved changes to {config.ONTOLOGY_PATH}")
+        if _commit_change(onto, {"op": "create", "recipe": recipe_data}):
+            logger.info(f"[Celery] Journaled creation of {title}")
+        else:
+            logger.info("[Celery] Recipe unchanged, skipping save")
 
-        return {"status": "created", "title": recipe_data.get("title")}
+        return {"status": "created", "title": title}
 
     except Exception as exc:
         logger.error(f"[Celery] Create failed: {exc}", exc_info=True)
@@ -210,19 +633,14 @@ def create_recipe_async(self, recipe_data: dict):
 @celery.task(name="recipes.delete_recipe", bind=True)
 def delete_recipe_async(self, recipe_name: str):
     """
-    Deletes a recipe and SAVES to the .nt file.
+    Deletes a recipe and records it in the ontology journal.
     """
     try:
         logger.info(f"[Celery] Deleting recipe: {recipe_name}")
         onto = _get_ontology_for_tasks()
-        config = get_config()
-
-        with onto:
-            success = delete_recipe_individual(recipe_name, target_kg=onto)
 
-        if success:
-            onto.save(file=config.ONTOLOGY_PATH, format="ntriples")
-            logger.info(f"[Celery] Saved deletion to {config.ONTOLOGY_PATH}")
+        if _commit_change(onto, {"op": "delete", "name": recipe_name}):
+            logger.info(f"[Celery] Journaled deletion of {recipe_name}")
             return {"status": "deleted", "name": recipe_name}
         else:
             return {"status": "not_found", "name": recipe_name}
@@ -238,32 +656,24 @@ def update_recipe_async(self, old_slug: str, recipe_data: dict):
     Update a recipe. If title changed, delete old individual and create new one.
     """
     try:
-        logger.info(f"[Celery] Updating recipe: {old_slug} -> {recipe_data.get('title')}")
+        new_title = recipe_data.get("title")
+        logger.info(f"[Celery] Updating recipe: {old_slug} -> {new_title}")
         onto = _get_ontology_for_tasks()
-        config = get_config()
 
-        new_title = recipe_data.get("title")
         if not new_title:
              raise ValueError("Recipe title is missing")
 
         new_slug = onthologifyName(new_title)
+        if old_slug != new_slug:
+            logger.info(f"[Celery] Title changed. Deleting old ID: {old_slug}")
 
-        with onto:
-            # 1. Handle Rename: If title changed, the ID changes, so delete the old one.
-            if old_slug != new_slug:
-                logger.info(f"[Celery] Title changed. Deleting old ID: {old_slug}")
-                delete_recipe_individual(old_slug, target_kg=onto)
-
-            # 2. Create/Overwrite the recipe with new data
-            create_single_recipe(recipe_data, target_kg=onto)
-
-        # 3. Persist
-        onto.save(file=config.ONTOLOGY_PATH, format="ntriples")
-        logger.info(f"[Celery] Update saved to {config.ONTOLOGY_PATH}")
+        if _commit_change(onto, {"op": "update", "old_slug": old_slug, "recipe": recipe_data}):
+            logger.info(f"[Celery] Journaled update of {new_slug}")
+        else:
+            logger.info("[Celery] Recipe unchanged, skipping save")
 
         return {"status": "updated", "slug": new_slug, "title": new_title}
 
     except Exception as exc:
         logger.error(f"[Celery] Update failed: {exc}", exc_info=True)
         raise self.retry(exc=exc, countdown=5, max_retries=3)
-    
\ No newline at end of file
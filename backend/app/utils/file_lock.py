@@ -0,0 +1,32 @@
+"""
+Exclusive lock across processes sharing a filesystem.
+
+Used by the ontology quadstore build and the recipe change journal, which
+both need a single writer among gunicorn and Celery worker processes.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive ``flock`` on ``lock_path``, waiting until it is free.
+
+    The kernel releases the lock when its holder closes the file or dies, so
+    a crashed or killed process never leaves a stale lock behind and no other
+    process can release a lock it does not hold. The lock file itself is left
+    in place; removing it would let two processes lock different files.
+
+    Args:
+        lock_path: Path of the lock file, created if missing
+    """
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor drops the lock
+        os.close(fd)
@@ -0,0 +1,49 @@
+"""
+orjson-backed JSON provider for Flask.
+
+This module plugs orjson into Flask's JSON machinery so that ``jsonify`` and
+every helper in ``response.py`` serialize, and ``request.get_json`` parse,
+with a C implementation instead of the standard library.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as JSON.
+
+        Args:
+            obj: The data to serialize
+            **kwargs: Options passed by Flask; ``sort_keys`` and ``indent``
+                are honoured, the rest only apply to the stdlib encoder
+
+        Returns:
+            JSON string
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        # Types orjson does not know (e.g. Decimal) go through Flask's fallback
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize data as JSON.
+
+        Args:
+            s: Text or UTF-8 bytes to parse
+            **kwargs: Options for the stdlib decoder, ignored by orjson
+
+        Returns:
+            Parsed Python object
+        """
+        # orjson.JSONDecodeError subclasses ValueError, so Flask still
+        # answers malformed bodies with 400 Bad Request
+        return orjson.loads(s)
@@ -155,12 +155,12 @@ def validate_ingredients(value: str) -> Tuple[Optional[List[str]], Optional[str]
         except json.JSONDecodeError as e:
             return None, f"Invalid JSON format for ingredients: {str(e)}"
     
-    # Otherwise treat as comma-separated string
-    ingredients = [i.strip() for i in value.split(',') if i.strip()]
+    # Otherwise treat as comma-separated string, stripping each item once
+    ingredients = [item for part in value.split(',') if (item := part.strip())]
     return ingredients, None
 
 
-def validate_recipe_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+def validate_recipe_filters(filters: Dict[str, Any]) -> Tuple[Dict[str, Any], int, int]:
     """
     Validate all recipe filter parameters.
     
@@ -168,7 +168,8 @@ def validate_recipe_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
         filters: Dictionary of filter parameters from request
     
     Returns:
-        Dictionary of validated and normalized filters
+        Tuple of (dictionary of validated and normalized filters, page,
+        per_page). Pagination defaults are applied when not given.
     
     Raises:
         ValidationError: If any validation fails
@@ -244,23 +245,141 @@ def validate_recipe_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
             validated['ingredients'] = val
     
     # Validate pagination parameters
+    page = 1
     if 'page' in filters:
         val, err = validate_integer(filters['page'], 'Page', min_val=1)
         if err:
             errors['page'] = [err]
         elif val is not None:
-            validated['page'] = val
+            page = val
     
+    per_page = current_app.config.get('DEFAULT_PAGE_SIZE', 20)
     if 'per_page' in filters:
         max_page_size = current_app.config.get('MAX_PAGE_SIZE', 100)
         val, err = validate_integer(filters['per_page'], 'Per page', min_val=1, max_val=max_page_size)
         if err:
             errors['per_page'] = [err]
         elif val is not None:
-            validated['per_page'] = val
+            per_page = val
     
     if errors:
         raise ValidationError(errors)
     
-    return validated
+    return validated, page, per_page
+
+
 
+def validate_recipe_payload(data: Any) -> Dict[str, Any]:
+    """
+    Validate and coerce a recipe body for the create and update endpoints.
+    
+    Everything the ontology code would otherwise coerce on the fly is checked
+    here, so bad input is rejected before a task ever touches the ontology.
+    
+    Args:
+        data: Parsed JSON request body
+    
+    Returns:
+        Copy of the body with time, difficulty, flags, ingredient amounts and
+        nutrients converted to their proper types
+    
+    Raises:
+        ValidationError: If any validation fails
+    """
+    if not isinstance(data, dict):
+        raise ValidationError({'body': ["Request body must be a JSON object"]})
+    
+    errors = {}
+    validated = dict(data)
+    
+    title = data.get('title')
+    if not isinstance(title, str) or not title.strip():
+        errors['title'] = ["Title is required"]
+    
+    instructions = data.get('instructions')
+    if instructions is not None and not isinstance(instructions, str):
+        errors['instructions'] = ["instructions must be a string"]
+    
+    if 'time' in data:
+        val, err = validate_integer(data['time'], 'Time', min_val=0)
+        if err:
+            errors['time'] = [err]
+        else:
+            validated['time'] = val
+    
+    if 'difficulty' in data:
+        min_diff = current_app.config.get('MIN_DIFFICULTY', 1)
+        max_diff = current_app.config.get('MAX_DIFFICULTY', 3)
+        val, err = validate_integer(data['difficulty'], 'Difficulty', min_diff, max_diff)
+        if err:
+            errors['difficulty'] = [err]
+        else:
+            validated['difficulty'] = val
+    
+    if 'meal_type' in data:
+        val, err = validate_meal_type(data['meal_type'])
+        if err:
+            errors['meal_type'] = [err]
+    
+    for bool_field in ['vegan', 'vegetarian']:
+        if bool_field in data:
+            val, err = validate_boolean(data[bool_field], bool_field.capitalize())
+            if err:
+                errors[bool_field] = [err]
+            else:
+                validated[bool_field] = bool(val)
+    
+    ingredients = data.get('ingredients')
+    if ingredients is not None:
+        if not isinstance(ingredients, list):
+            errors['ingredients'] = ["ingredients must be a list"]
+        else:
+            ingredient_errors = []
+            coerced = []
+            for i, ingredient in enumerate(ingredients):
+                if not isinstance(ingredient, dict):
+                    ingredient_errors.append(f"Ingredient {i} must be an object")
+                    continue
+                ing_id = ingredient.get('id', ingredient.get('name'))
+                if not isinstance(ing_id, str) or not ing_id:
+                    ingredient_errors.append(f"Ingredient {i} needs an id or name")
+                    continue
+                ingredient = dict(ingredient)
+                if 'amount' in ingredient:
+                    val, err = validate_positive_number(ingredient['amount'], f"Ingredient {i} amount", allow_zero=True)
+                    if err:
+                        ingredient_errors.append(err)
+                        continue
+                    if val is None:
+                        del ingredient['amount']
+                    else:
+                        ingredient['amount'] = val
+                coerced.append(ingredient)
+            if ingredient_errors:
+                errors['ingredients'] = ingredient_errors
+            else:
+                validated['ingredients'] = coerced
+    
+    nutrients = data.get('nutrients')
+    if nutrients is not None:
+        if not isinstance(nutrients, dict):
+            errors['nutrients'] = ["nutrients must be an object"]
+        else:
+            nutrient_errors = []
+            coerced = dict(nutrients)
+            for key in ('kcal', 'protein', 'fat', 'carbs'):
+                if key in nutrients:
+                    val, err = validate_positive_number(nutrients[key], key, allow_zero=True)
+                    if err:
+                        nutrient_errors.append(err)
+                    else:
+                        coerced[key] = val if val is not None else 0.0
+            if nutrient_errors:
+                errors['nutrients'] = nutrient_errors
+            else:
+                validated['nutrients'] = coerced
+    
+    if errors:
+        raise ValidationError(errors)
+    
+    return validated
@@ -28,11 +28,25 @@ class Config:
     
     ONTOLOGY_CACHE_FILENAME = os.getenv('ONTOLOGY_CACHE_FILENAME', 'feinschmecker.rdf')
 
+    # Persistent Owlready2 quadstore, reused across restarts to skip re-parsing
+    ONTOLOGY_QUADSTORE_FILENAME = os.getenv('ONTOLOGY_QUADSTORE_FILENAME', 'feinschmecker.sqlite3')
+    ONTOLOGY_LOCK_TIMEOUT = int(os.getenv("ONTOLOGY_LOCK_TIMEOUT", "300"))
+    # Recipe changes are journaled; the N-Triples file is rewritten every N entries
+    ONTOLOGY_JOURNAL_COMPACT_EVERY = int(os.getenv("ONTOLOGY_JOURNAL_COMPACT_EVERY", "100"))
+    # Seconds a due compaction waits so bursts of changes share one full save
+    ONTOLOGY_COMPACT_DELAY = float(os.getenv("ONTOLOGY_COMPACT_DELAY", "0.25"))
+
+    # Refuse to start without owlready2's compiled (Cython) parser/serializer
+    OWLREADY2_REQUIRE_OPTIMIZED = os.getenv("OWLREADY2_OPTIMIZED", "0") == "1"
+
 
     # API settings
     API_TITLE = "Feinschmecker API"
     API_VERSION = "1.0"
 
+    # Largest recipe create/update body accepted before parsing (bytes)
+    MAX_RECIPE_BODY_BYTES = int(os.getenv("MAX_RECIPE_BODY_BYTES", str(256 * 1024)))
+
     # Pagination defaults
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
@@ -52,6 +66,8 @@ class Config:
     CACHE_TYPE = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))  # 5 minutes
     CACHE_THRESHOLD = 500  # Maximum number of items the cache will store
+    # Seconds Celery workers keep search results in Redis (per ontology version)
+    SEARCH_CACHE_TIMEOUT = int(os.getenv("SEARCH_CACHE_TIMEOUT", "300"))
 
     # Rate limiting
     RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "True").lower() == "true"
@@ -59,6 +75,8 @@ class Config:
     # Use Redis for rate limiting storage if REDIS_URL is available, otherwise fallback to memory
     REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
     RATELIMIT_STORAGE_URL = os.getenv("RATELIMIT_STORAGE_URL", REDIS_URL)
+    # Moving window is checked atomically in Redis, so all workers share one budget
+    RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window")
 
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -58,6 +58,16 @@ def on_reload(server):
     """Called to recycle workers during a reload."""
     server.log.info("Reloading Feinschmecker API server")
 
+def post_fork(server, worker):
+    """Called just after a worker has been forked."""
+    # Warm up Celery connections per worker; the preloaded master never uses
+    # them. This runs in the background: with Redis down a blocking ping
+    # could keep the worker from booting within `timeout`.
+    from backend.app import warm_celery_connections
+    from backend.website import app
+
+    warm_celery_connections(app)
+
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info(f"Feinschmecker API server is ready. Listening on {bind}")
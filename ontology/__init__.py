@@ -101,7 +101,7 @@ from .constraints import (
 # Individual creation
 from .individuals import (
     onthologifyName, createIndividual, create_meal_types, create_difficulties,
-    load_recipes_from_json
+    get_static_individuals, clear_individual_caches, load_recipes_from_json
 )
 
 # Query functions
@@ -7,7 +7,9 @@ Supports multiple knowledge graphs for different data sources.
 
 import json
 import re
-from owlready2 import Thing
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+from owlready2 import Thing, destroy_entity
 from .setup import kg_onto, schema_onto
 from .classes import (
     Recipe, Ingredient, IngredientWithAmount, Author, Source,
@@ -25,17 +27,55 @@ from .properties import (
 )
 
 
+# MealType/Difficulty individuals per knowledge graph base IRI, built once
+_static_individuals = {}
+
+# Individuals by name per knowledge graph object, built on first use. Weak
+# keys so destroyed knowledge graphs do not keep their index alive.
+_individual_index = WeakKeyDictionary()
+
+# Recipe properties that create_single_recipe rewrites on update
+_RECIPE_PROPERTY_NAMES = frozenset((
+    "has_recipe_name", "has_instructions", "has_ingredient", "authored_by",
+    "requires_time", "has_difficulty", "is_meal_type", "is_vegan",
+    "is_vegetarian", "has_calories", "has_protein", "has_fat",
+    "has_carbohydrates", "has_link", "has_image_link",
+))
+
+# Characters that are not allowed in individual names and their replacements
+_NAME_TRANSLATION = str.maketrans({" ": "_", "%": "percent", "&": "and"})
+
+# Ingredient ids that already start with an amount, e.g. "200g flour"
+_AMOUNT_PREFIX_RE = re.compile(r"\d")
+
+# Nutrients of a recipe: (input key, name prefix, class, amount property, recipe property)
+_NUTRIENTS = (
+    ("kcal", "calories_", Calories, "amount_of_calories", "has_calories"),
+    ("protein", "protein_", Protein, "amount_of_protein", "has_protein"),
+    ("fat", "fat_", Fat, "amount_of_fat", "has_fat"),
+    ("carbs", "carbohydrates_", Carbohydrates, "amount_of_carbohydrates", "has_carbohydrates"),
+)
+
+# Name prefix of Time individuals and link prefix of recipes without a link
+_TIME_PREFIX = "time_"
+_RECIPE_LINK_PREFIX = "http://feinschmecker.local/recipe/"
+
+
+@lru_cache(maxsize=4096, typed=True)
 def onthologifyName(name) -> str:
     """
     Convert a name to a valid ontology identifier.
     
+    Results are cached, as the same ingredient and author names come up
+    again and again.
+    
     Args:
         name: The name to convert
     
     Returns:
         Sanitized name suitable for use as an ontology identifier
     """
-    return str(name).lower().replace(" ", "_").replace("%", "percent").replace("&", "and")
+    return str(name).lower().translate(_NAME_TRANSLATION)
 
 
 def createIndividual(name, BaseClass, unique=False, target_kg=None) -> tuple[Thing, bool]:
@@ -61,12 +101,14 @@ def createIndividual(name, BaseClass, unique=False, target_kg=None) -> tuple[Thi
         target_kg = kg_onto
     
     name = onthologifyName(name)
-    individual = target_kg[name]
+    index = _get_individual_index(target_kg)
+    individual = index.get(name)
 
     # If it doesn't exist, create it
     if individual is None:
         with target_kg:
-            return BaseClass(name), False
+            individual = index[name] = BaseClass(name)
+        return individual, False
     
     # If it exists and unique=True was requested, fail
     if unique:
@@ -95,8 +137,9 @@ def create_meal_types(target_kg=None):
     meal_type_names = ["Dinner", "Lunch", "Breakfast"]
     meal_types = {}
     for meal_type_name in meal_type_names:
-        meal_type, _ = createIndividual(meal_type_name, MealType, unique=False, target_kg=target_kg)
-        meal_type.has_meal_type_name.append(meal_type_name)
+        meal_type, existed = createIndividual(meal_type_name, MealType, unique=False, target_kg=target_kg)
+        if not existed:
+            meal_type.has_meal_type_name.append(meal_type_name)
         meal_types[meal_type_name] = meal_type
     return meal_types
 
@@ -113,12 +156,125 @@ def create_difficulties(target_kg=None):
     """
     difficulties = []
     for i in range(1, 4):
-        diff, _ = createIndividual("difficulty_" + str(i), Difficulty, unique=False, target_kg=target_kg)
-        diff.has_numeric_difficulty.append(i)
+        diff, existed = createIndividual("difficulty_" + str(i), Difficulty, unique=False, target_kg=target_kg)
+        if not existed:
+            diff.has_numeric_difficulty.append(i)
         difficulties.append(diff)
     return difficulties
 
 
+def _ingredient_with_amount_name(ing_id) -> str:
+    """
+    Get the IngredientWithAmount name for an ingredient id.
+    
+    Ids without a leading amount are treated as a single unit ("1 ...").
+    
+    Args:
+        ing_id: Ingredient id as found in the recipe data
+    
+    Returns:
+        Name for the IngredientWithAmount individual
+    """
+    if ing_id and _AMOUNT_PREFIX_RE.match(ing_id):
+        return ing_id
+    return f"1 {ing_id}"
+
+
+def get_static_individuals(target_kg=None):
+    """
+    Get the standard meal type and difficulty individuals of a knowledge graph.
+    
+    They are resolved once per knowledge graph and reused afterwards, instead of
+    being looked up again for every recipe that is created.
+    
+    Args:
+        target_kg: Target knowledge graph (defaults to kg_onto)
+    
+    Returns:
+        Tuple of (meal types dictionary, difficulties list)
+    """
+    if target_kg is None:
+        target_kg = kg_onto
+    
+    cached = _static_individuals.get(target_kg.base_iri)
+    if cached is None:
+        cached = (create_meal_types(target_kg=target_kg), create_difficulties(target_kg=target_kg))
+        _static_individuals[target_kg.base_iri] = cached
+    return cached
+
+
+def _assign(individual, prop_name, values) -> bool:
+    """
+    Set a property unless it already holds the same values.
+    
+    Args:
+        individual: Individual to modify
+        prop_name: Python name of the property
+        values: New list of values
+    
+    Returns:
+        True if the property was written
+    """
+    current = getattr(individual, prop_name)
+    if len(current) == len(values) and set(current) == set(values):
+        return False
+    setattr(individual, prop_name, values)
+    return True
+
+
+def _fill_if_empty(individual, prop_name, values) -> bool:
+    """
+    Set a property only if it has no values yet, reading it a single time.
+    
+    Args:
+        individual: Individual to modify
+        prop_name: Python name of the property
+        values: List of values to set
+    
+    Returns:
+        True if the property was written
+    """
+    if getattr(individual, prop_name):
+        return False
+    setattr(individual, prop_name, values)
+    return True
+
+
+def _get_individual_index(target_kg):
+    """
+    Get the name -> individual index of a knowledge graph.
+    
+    The index is built from a single pass over the knowledge graph and then
+    kept up to date by the functions in this module, so lookups are plain
+    dictionary accesses instead of queries against the quadstore.
+    
+    Like ``target_kg[name]``, it only holds individuals in the knowledge
+    graph's own namespace; individuals of other namespaces may share a name.
+    
+    Args:
+        target_kg: Knowledge graph to index
+    
+    Returns:
+        Dictionary mapping individual names to individuals
+    """
+    index = _individual_index.get(target_kg)
+    if index is None:
+        base_iri = target_kg.base_iri
+        index = {
+            individual.name: individual
+            for individual in target_kg.individuals()
+            if individual.iri == base_iri + individual.name
+        }
+        _individual_index[target_kg] = index
+    return index
+
+
+def clear_individual_caches():
+    """Forget cached individuals, e.g. after the ontology has been reloaded."""
+    _static_individuals.clear()
+    _individual_index.clear()
+
+
 def load_recipes_from_json(json_path: str, target_kg=None):
     """
     Load recipe individuals from a JSON file into a knowledge graph.
@@ -159,36 +315,36 @@ def load_recipes_from_json(json_path: str, target_kg=None):
     recipes_created = 0
     
     for json_recipe in recipes:
-        if target_kg[onthologifyName(json_recipe["title"])] is not None:
+        recipe, existed = createIndividual(json_recipe["title"], BaseClass=Recipe, target_kg=target_kg)
+        if existed:
             continue
         
-        recipe, _ = createIndividual(json_recipe["title"], BaseClass=Recipe, unique=True, target_kg=target_kg)
         recipe.has_recipe_name.append(json_recipe["title"])
         recipe.has_instructions.append(str(json_recipe["instructions"]))
 
-        # Create IngredientWithAmount individuals
+        # Create IngredientWithAmount individuals, linked to the recipe in one go below
+        ingredient_individuals = []
         for extendedIngredient in json_recipe["ingredients"]:
-            if re.search(r'\d', extendedIngredient["id"][0]):  # Check if first character is digit
-                ingredientWithAmount, existed = createIndividual(extendedIngredient["id"], BaseClass=IngredientWithAmount, target_kg=target_kg)
-            else:
-                ingredientWithAmount, existed = createIndividual("1 " + extendedIngredient["id"], BaseClass=IngredientWithAmount, target_kg=target_kg)
+            ingredientWithAmount, existed = createIndividual(_ingredient_with_amount_name(extendedIngredient["id"]), BaseClass=IngredientWithAmount, target_kg=target_kg)
             
             if existed:
-                recipe.has_ingredient.append(ingredientWithAmount)
+                ingredient_individuals.append(ingredientWithAmount)
                 continue
             
-            ingredientWithAmount.has_ingredient_with_amount_name.append(extendedIngredient["id"])
+            # Freshly created individuals have no values, so set the lists directly
+            ingredientWithAmount.has_ingredient_with_amount_name = [extendedIngredient["id"]]
             if extendedIngredient["amount"] is not None:
-                ingredientWithAmount.amount_of_ingredient.append(float(extendedIngredient["amount"]))
+                ingredientWithAmount.amount_of_ingredient = [float(extendedIngredient["amount"])]
             else:
-                ingredientWithAmount.amount_of_ingredient.append(1)
-            ingredientWithAmount.unit_of_ingredient.append(str(extendedIngredient["unit"]))
+                ingredientWithAmount.amount_of_ingredient = [1]
+            ingredientWithAmount.unit_of_ingredient = [str(extendedIngredient["unit"])]
             
             ingredient, existed = createIndividual(extendedIngredient["ingredient"], BaseClass=Ingredient, target_kg=target_kg)
             if not existed:
-                ingredient.has_ingredient_name.append(extendedIngredient["ingredient"])
-            ingredientWithAmount.type_of_ingredient.append(ingredient)
-            recipe.has_ingredient.append(ingredientWithAmount)
+                ingredient.has_ingredient_name = [extendedIngredient["ingredient"]]
+            ingredientWithAmount.type_of_ingredient = [ingredient]
+            ingredient_individuals.append(ingredientWithAmount)
+        recipe.has_ingredient.extend(ingredient_individuals)
 
         # Create or get author
         author, existed = createIndividual(json_recipe["author"], BaseClass=Author, target_kg=target_kg)
@@ -212,35 +368,22 @@ def load_recipes_from_json(json_path: str, target_kg=None):
         recipe.is_vegetarian.append(json_recipe["vegetarian"])
         
         # Calculate and assign difficulty
-        if len(recipe.has_ingredient) * 3 + time.amount_of_time[0] < 20:  # Easy
+        score = len(ingredient_individuals) * 3 + time.amount_of_time[0]
+        if score < 20:  # Easy
             recipe.has_difficulty.append(difficulties[0])
-        elif len(recipe.has_ingredient) * 3 + time.amount_of_time[0] < 60:  # Moderate
+        elif score < 60:  # Moderate
             recipe.has_difficulty.append(difficulties[1])
         else:  # Difficult
             recipe.has_difficulty.append(difficulties[2])
 
         # Create nutrient individuals
         nutrients = json_recipe["nutrients"]
-        
-        calories, existed = createIndividual("calories_" + str(nutrients["kcal"]), BaseClass=Calories, target_kg=target_kg)
-        if not existed:
-            calories.amount_of_calories.append(float(nutrients["kcal"]))
-        recipe.has_calories.append(calories)
-
-        protein, existed = createIndividual("protein_" + str(nutrients["protein"]), BaseClass=Protein, target_kg=target_kg)
-        if not existed:
-            protein.amount_of_protein.append(float(nutrients["protein"]))
-        recipe.has_protein.append(protein)
-
-        fat, existed = createIndividual("fat_" + str(nutrients["fat"]), BaseClass=Fat, target_kg=target_kg)
-        if not existed:
-            fat.amount_of_fat.append(float(nutrients["fat"]))
-        recipe.has_fat.append(fat)
-
-        carbohydrates, existed = createIndividual("carbohydrates_" + str(nutrients["carbs"]), BaseClass=Carbohydrates, target_kg=target_kg)
-        if not existed:
-            carbohydrates.amount_of_carbohydrates.append(float(nutrients["carbs"]))
-        recipe.has_carbohydrates.append(carbohydrates)
+        for key, prefix, NutrientClass, amount_prop, recipe_prop in _NUTRIENTS:
+            nutrient, existed = createIndividual(prefix + str(nutrients[key]), BaseClass=NutrientClass, target_kg=target_kg)
+            if not existed:
+                setattr(nutrient, amount_prop, [float(nutrients[key])])
+            # The recipe is new as well, so there is no current list to fetch
+            setattr(recipe, recipe_prop, [nutrient])
 
         # Add links
         recipe.has_link.append(json_recipe["source"])
@@ -251,17 +394,23 @@ def load_recipes_from_json(json_path: str, target_kg=None):
     return recipes_created
 
 
-def create_single_recipe(recipe_data: dict, target_kg=None) -> Thing:
+def create_single_recipe(recipe_data: dict, target_kg=None) -> tuple[Thing, bool]:
     """
     Create OR Update a single recipe individual.
     Ensures all strict SPARQL requirements (Author, Source, Image) are met.
+    
+    Properties are only written when their values differ, so re-submitting
+    an unchanged recipe leaves the ontology untouched.
+    
+    Returns:
+        Tuple of (recipe, changed) where changed is True if anything in the
+        knowledge graph was created or modified
     """
     if target_kg is None:
         target_kg = kg_onto
 
     # Ensure dependencies exist
-    meal_types = create_meal_types(target_kg=target_kg)
-    difficulties = create_difficulties(target_kg=target_kg)
+    meal_types, difficulties = get_static_individuals(target_kg=target_kg)
     
     # 1. Identify Recipe
     title = recipe_data.get("title") or recipe_data.get("name")
@@ -269,170 +418,202 @@ def create_single_recipe(recipe_data: dict, target_kg=None) -> Thing:
         raise ValueError("Recipe must have a title")
 
     recipe_name = onthologifyName(title)
-    
-    # Check if exists
-    if target_kg[recipe_name] is not None:
-         recipe = target_kg[recipe_name]
-         # Clear properties for clean update
-         recipe.has_recipe_name = []
-         recipe.has_instructions = []
-         recipe.has_ingredient = []
-         recipe.authored_by = []
-         recipe.requires_time = []
-         recipe.has_difficulty = []
-         recipe.is_meal_type = []
-         recipe.is_vegan = []
-         recipe.is_vegetarian = []
-         recipe.has_calories = []
-         recipe.has_protein = []
-         recipe.has_fat = []
-         recipe.has_carbohydrates = []
-         recipe.has_link = []
-         recipe.has_image_link = []
-    else:
-        recipe, _ = createIndividual(title, BaseClass=Recipe, unique=False, target_kg=target_kg)
+
+    # Normalize the input once, so every individual name is known up front
+    ingredients = []
+    for extendedIngredient in recipe_data.get("ingredients", ()):
+        ing_id = extendedIngredient.get("id", extendedIngredient.get("name"))
+        name_for_ind = onthologifyName(_ingredient_with_amount_name(ing_id))
+        ing_name = extendedIngredient.get("ingredient", ing_id)
+        ingredients.append((extendedIngredient, ing_id, name_for_ind, ing_name, onthologifyName(ing_name)))
+
+    # Get values or defaults
+    author_name = recipe_data.get("author") or "Unknown Author"
+    source_name = recipe_data.get("source") or "User Submission"
+
+    time_val = None
+    if "time" in recipe_data:
+        try:
+            time_val = int(recipe_data["time"])
+        except (ValueError, TypeError):
+            time_val = 30 
+
+    nutrient_values = None
+    if "nutrients" in recipe_data:
+        nutrients = recipe_data["nutrients"]
+        # Use 0.0 as default if missing to ensure data consistency
+        nutrient_values = tuple(float(nutrients.get(key, 0)) for key, *_ in _NUTRIENTS)
+
+    # Name index of the knowledge graph; individuals created below are added to it
+    existing = _get_individual_index(target_kg)
+    get_existing = existing.get
+    changed = False
+
+    def get_or_create(name, BaseClass):
+        nonlocal changed
+        name = onthologifyName(name)
+        individual = get_existing(name)
+        if individual is None:
+            with target_kg:
+                individual = existing[name] = BaseClass(name)
+            changed = True
+        return individual
+
+    def assign(individual, prop_name, values):
+        nonlocal changed
+        if _assign(individual, prop_name, values):
+            changed = True
+
+    def fill(individual, prop_name, values):
+        nonlocal changed
+        if _fill_if_empty(individual, prop_name, values):
+            changed = True
+
+    # Check if exists; its properties are rewritten from recipe_values at the end
+    recipe = get_existing(recipe_name)
+    is_new = recipe is None
+    if is_new:
+        recipe = get_or_create(title, Recipe)
+    recipe_values = {}
 
     # 2. Add Properties
-    recipe.has_recipe_name.append(title)
+    recipe_values["has_recipe_name"] = [title]
     
     # Instructions default
     instr = recipe_data.get("instructions", "No instructions provided.")
-    recipe.has_instructions.append(str(instr))
+    recipe_values["has_instructions"] = [str(instr)]
 
     # 3. Ingredients
-    if "ingredients" in recipe_data:
-        for extendedIngredient in recipe_data["ingredients"]:
-            ing_id = extendedIngredient.get("id", extendedIngredient.get("name"))
-            
-            if ing_id and re.search(r'\d', ing_id[0]):
-                name_for_ind = ing_id
-            else:
-                name_for_ind = f"1 {ing_id}"
-                
-            ingredientWithAmount, existed = createIndividual(name_for_ind, BaseClass=IngredientWithAmount, target_kg=target_kg)
-            
-            ingredientWithAmount.has_ingredient_with_amount_name = [ing_id]
-            try:
-                amt = float(extendedIngredient.get("amount", 1))
-            except (ValueError, TypeError):
-                amt = 1.0
-            ingredientWithAmount.amount_of_ingredient = [amt]
-            ingredientWithAmount.unit_of_ingredient = [str(extendedIngredient.get("unit", ""))]
-            
-            ing_name = extendedIngredient.get("ingredient", ing_id)
-            base_ingredient, _ = createIndividual(ing_name, BaseClass=Ingredient, target_kg=target_kg)
-            if not base_ingredient.has_ingredient_name:
-                base_ingredient.has_ingredient_name = [ing_name]
-            
-            ingredientWithAmount.type_of_ingredient = [base_ingredient]
-            recipe.has_ingredient.append(ingredientWithAmount)
+    # Create all missing ingredient individuals in one go, then fill them in
+    missing = {}
+    for _, _, name_for_ind, _, ing_key in ingredients:
+        if name_for_ind not in existing:
+            missing.setdefault(name_for_ind, IngredientWithAmount)
+        if ing_key not in existing:
+            missing.setdefault(ing_key, Ingredient)
+    if missing:
+        with target_kg:
+            for name, BaseClass in missing.items():
+                existing[name] = BaseClass(name)
+        changed = True
+
+    ingredient_individuals = []
+    for extendedIngredient, ing_id, name_for_ind, ing_name, ing_key in ingredients:
+        ingredientWithAmount = existing[name_for_ind]
+        
+        assign(ingredientWithAmount, "has_ingredient_with_amount_name", [ing_id])
+        try:
+            amt = float(extendedIngredient.get("amount", 1))
+        except (ValueError, TypeError):
+            amt = 1.0
+        assign(ingredientWithAmount, "amount_of_ingredient", [amt])
+        assign(ingredientWithAmount, "unit_of_ingredient", [str(extendedIngredient.get("unit", ""))])
+        
+        base_ingredient = existing[ing_key]
+        fill(base_ingredient, "has_ingredient_name", [ing_name])
+        
+        assign(ingredientWithAmount, "type_of_ingredient", [base_ingredient])
+        ingredient_individuals.append(ingredientWithAmount)
+    recipe_values["has_ingredient"] = ingredient_individuals
 
     # 4. Author & Source (STRICT QUERY REQUIREMENTS FIX)
     # ---------------------------------------------------------
-    # Get values or defaults
-    author_name = recipe_data.get("author") or "Unknown Author"
-    source_name = recipe_data.get("source") or "User Submission"
-    
     # Create Author
-    author_ind, _ = createIndividual(author_name, BaseClass=Author, target_kg=target_kg)
-    if not author_ind.has_author_name:
-        author_ind.has_author_name = [author_name]
-    recipe.authored_by = [author_ind]
+    author_ind = get_or_create(author_name, Author)
+    fill(author_ind, "has_author_name", [author_name])
+    recipe_values["authored_by"] = [author_ind]
 
     # Create Source
-    source_ind, _ = createIndividual(source_name, BaseClass=Source, target_kg=target_kg)
-    if not source_ind.has_source_name:
-        source_ind.has_source_name = [source_name]
+    source_ind = get_or_create(source_name, Source)
+    fill(source_ind, "has_source_name", [source_name])
     
     # REQUIREMENT: Source MUST have a website link
-    if not source_ind.is_website:
-        source_ind.is_website = ["http://feinschmecker.local"]
+    fill(source_ind, "is_website", ["http://feinschmecker.local"])
 
     # REQUIREMENT: Author MUST be linked to Source
-    if source_ind not in author_ind.is_author_of:
-        author_ind.is_author_of.append(source_ind)
+    author_sources = author_ind.is_author_of
+    if source_ind not in author_sources:
+        author_sources.append(source_ind)
+        changed = True
     # ---------------------------------------------------------
 
     # 5. Recipe Links & Images (STRICT QUERY REQUIREMENTS FIX)
     # ---------------------------------------------------------
     # REQUIREMENT: Recipe MUST have a direct link
-    if "link" in recipe_data and recipe_data["link"]:
-        recipe.has_link = [recipe_data["link"]]
+    link = recipe_data.get("link")
+    if link:
+        recipe_values["has_link"] = [link]
     else:
-        recipe.has_link = [f"http://feinschmecker.local/recipe/{recipe_name}"]
+        recipe_values["has_link"] = [_RECIPE_LINK_PREFIX + recipe_name]
 
     # REQUIREMENT: Recipe MUST have an image link
-    if "image" in recipe_data and recipe_data["image"]:
-        recipe.has_image_link = [recipe_data["image"]]
+    image = recipe_data.get("image")
+    if image:
+        recipe_values["has_image_link"] = [image]
     else:
         # Placeholder image so the query doesn't filter this recipe out
-        recipe.has_image_link = ["https://via.placeholder.com/300?text=No+Image"]
+        recipe_values["has_image_link"] = ["https://via.placeholder.com/300?text=No+Image"]
     # ---------------------------------------------------------
 
     # 6. Time & Difficulty
-    if "time" in recipe_data:
-        try:
-            time_val = int(recipe_data["time"])
-        except (ValueError, TypeError):
-            time_val = 30 
-            
-        time_ind, _ = createIndividual(f"time_{time_val}", BaseClass=Time, target_kg=target_kg)
-        time_ind.amount_of_time = [time_val]
-        recipe.requires_time = [time_ind]
+    if time_val is not None:
+        time_ind = get_or_create(_TIME_PREFIX + str(time_val), Time)
+        assign(time_ind, "amount_of_time", [time_val])
+        recipe_values["requires_time"] = [time_ind]
         
-        if "difficulty" in recipe_data:
+        difficulty = None
+        requested_difficulty = recipe_data.get("difficulty")
+        if requested_difficulty is not None:
             try:
-                diff_idx = int(recipe_data["difficulty"]) - 1
+                diff_idx = int(requested_difficulty) - 1
                 if 0 <= diff_idx < len(difficulties):
-                    recipe.has_difficulty = [difficulties[diff_idx]]
+                    difficulty = difficulties[diff_idx]
             except (ValueError, TypeError):
                 pass 
         
-        if not recipe.has_difficulty:
-            ing_count = len(recipe.has_ingredient)
-            if ing_count * 3 + time_val < 20:
-                recipe.has_difficulty = [difficulties[0]]
-            elif ing_count * 3 + time_val < 60:
-                recipe.has_difficulty = [difficulties[1]]
+        if difficulty is None:
+            score = len(ingredient_individuals) * 3 + time_val
+            if score < 20:
+                difficulty = difficulties[0]
+            elif score < 60:
+                difficulty = difficulties[1]
             else:
-                recipe.has_difficulty = [difficulties[2]]
+                difficulty = difficulties[2]
+        recipe_values["has_difficulty"] = [difficulty]
 
     # 7. Meal Type
-    if "meal_type" in recipe_data:
-        mt_name = recipe_data["meal_type"]
-        if mt_name in meal_types:
-            recipe.is_meal_type = [meal_types[mt_name]]
+    meal_type = meal_types.get(recipe_data.get("meal_type"))
+    if meal_type is not None:
+        recipe_values["is_meal_type"] = [meal_type]
 
     # 8. Dietary Flags
-    recipe.is_vegan = [bool(recipe_data.get("vegan", False))]
-    recipe.is_vegetarian = [bool(recipe_data.get("vegetarian", False))]
+    recipe_values["is_vegan"] = [bool(recipe_data.get("vegan", False))]
+    recipe_values["is_vegetarian"] = [bool(recipe_data.get("vegetarian", False))]
 
     # 9. Nutrients
-    if "nutrients" in recipe_data:
-        nutrients = recipe_data["nutrients"]
-        # Use 0.0 as default if missing to ensure data consistency
-        kcal = float(nutrients.get("kcal", 0))
-        prot = float(nutrients.get("protein", 0))
-        fat_val = float(nutrients.get("fat", 0))
-        carb = float(nutrients.get("carbs", 0))
-
-        calories, _ = createIndividual(f"calories_{kcal}", BaseClass=Calories, target_kg=target_kg)
-        calories.amount_of_calories = [kcal]
-        recipe.has_calories = [calories]
-
-        protein, _ = createIndividual(f"protein_{prot}", BaseClass=Protein, target_kg=target_kg)
-        protein.amount_of_protein = [prot]
-        recipe.has_protein = [protein]
-
-        fat, _ = createIndividual(f"fat_{fat_val}", BaseClass=Fat, target_kg=target_kg)
-        fat.amount_of_fat = [fat_val]
-        recipe.has_fat = [fat]
-
-        carbs, _ = createIndividual(f"carbohydrates_{carb}", BaseClass=Carbohydrates, target_kg=target_kg)
-        carbs.amount_of_carbohydrates = [carb]
-        recipe.has_carbohydrates = [carbs]
+    if nutrient_values is not None:
+        for (_, prefix, NutrientClass, amount_prop, recipe_prop), value in zip(_NUTRIENTS, nutrient_values):
+            nutrient = get_or_create(prefix + str(value), NutrientClass)
+            assign(nutrient, amount_prop, [value])
+            recipe_values[recipe_prop] = [nutrient]
+
+    # 10. Write the recipe, clearing properties the new data does not set
+    if is_new:
+        # A fresh individual has no values yet, so there is nothing to compare or clear
+        for prop_name, values in recipe_values.items():
+            setattr(recipe, prop_name, values)
+    else:
+        # One query tells which properties hold values; the others need no read
+        present = {prop.python_name for prop in recipe.get_properties()}
+        for prop_name in _RECIPE_PROPERTY_NAMES:
+            values = recipe_values.get(prop_name)
+            if prop_name in present:
+                assign(recipe, prop_name, values or [])
+            elif values:
+                setattr(recipe, prop_name, values)
+                changed = True
 
-    return recipe
+    return recipe, changed
 
 
 
@@ -442,10 +623,9 @@ def delete_recipe_individual(recipe_name: str, target_kg=None):
         target_kg = kg_onto
     
     name = onthologifyName(recipe_name)
-    individual = target_kg[name]
+    individual = _get_individual_index(target_kg).pop(name, None)
     
     if individual:
-        from owlready2 import destroy_entity
         destroy_entity(individual)
         return True
     return False
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the backend tests.
+
+Tests never talk to a real Redis or download the remote ontology: REDIS_URL
+points at a closed local port and the ontology cache lives in a temporary
+directory. Both are set before any backend module reads them.
+"""
+
+import os
+import tempfile
+
+os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+os.environ.setdefault("ONTOLOGY_CACHE_DIR", tempfile.mkdtemp(prefix="feinschmecker-tests-"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def flask_app():
+    """Application created once per test session with the testing config."""
+    from backend.app import create_app
+
+    return create_app("testing")
@@ -0,0 +1,122 @@
+"""
+Tests for downloading the remote ontology into the local cache.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+
+import backend.app as app_module
+from backend.app import download_ontology
+
+CONTENT = bytes(range(256)) * 64
+
+
+class OntologyHandler(BaseHTTPRequestHandler):
+    """Serves CONTENT with the behaviour configured on the server."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_headers(self, status, length):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        for name, value in self.server.validators.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", None))
+        if self.server.reject_head:
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_headers(200, len(CONTENT))
+
+    def do_GET(self):
+        byte_range = self.headers.get("Range")
+        self.server.requests.append(("GET", byte_range))
+        if byte_range:
+            if self.headers.get("If-Range") not in self.server.validators.values():
+                self._send_headers(200, len(CONTENT))
+                self.wfile.write(CONTENT)
+                return
+            start, end = (int(x) for x in byte_range.split("=")[1].split("-"))
+            body = CONTENT[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self._send_headers(200, len(CONTENT))
+        self.wfile.write(CONTENT)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), OntologyHandler)
+    httpd.requests = []
+    httpd.reject_head = False
+    httpd.validators = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Small chunks so CONTENT counts as large enough for ranged mode
+    monkeypatch.setattr(app_module, "DOWNLOAD_CHUNK_SIZE", 1024)
+    app = Flask("test")
+    app.config.update(
+        ONTOLOGY_CACHE_DIR=str(tmp_path),
+        ONTOLOGY_CACHE_FILENAME="feinschmecker.rdf",
+        REQUEST_TIMEOUT=5,
+    )
+    return app
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_port}/feinschmecker.rdf"
+
+
+def test_rejected_head_falls_back_to_get(app, server):
+    server.reject_head = True
+
+    path = download_ontology(app, _url(server))
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests == [("HEAD", None), ("GET", None)]
+
+
+def test_ranges_need_a_validator(app, server):
+    path = download_ontology(app, _url(server))
+
+    assert path.read_bytes() == CONTENT
+    assert ("GET", None) in server.requests
+    assert not [r for r in server.requests if r[1]]
+
+
+def test_ranges_send_the_etag_as_if_range(app, server):
+    server.validators = {"ETag": '"v1"'}
+
+    path = download_ontology(app, _url(server))
+
+    assert path.read_bytes() == CONTENT
+    assert len([r for r in server.requests if r[1]]) == app_module.DOWNLOAD_WORKERS
+    assert path.with_name(path.name + ".etag").read_text() == '"v1"'
+
+
+def test_ranges_fall_back_to_last_modified(app, server):
+    server.validators = {"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    path = download_ontology(app, _url(server))
+
+    assert path.read_bytes() == CONTENT
+    assert len([r for r in server.requests if r[1]]) == app_module.DOWNLOAD_WORKERS
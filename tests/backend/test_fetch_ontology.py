@@ -0,0 +1,111 @@
+"""
+Tests for coordinating the ontology download across workers through Redis.
+"""
+
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+import backend.app as app_module
+from backend.app import ONTOLOGY_DOWNLOAD_LOCK_KEY, fetch_ontology
+
+
+class FakePubSub:
+    """Pub/sub handle that never receives a message."""
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout=None):
+        return None
+
+    def close(self):
+        pass
+
+
+class FakeRedis:
+    """Just enough of a Redis client for fetch_ontology."""
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub()
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def eval(self, script, numkeys, key, token):
+        # Same compare-and-delete as the Lua release script
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask("test")
+    app.config.update(
+        REDIS_URL="redis://localhost:6379/0",
+        ONTOLOGY_LOCK_TIMEOUT=0,
+        ONTOLOGY_CACHE_DIR=str(tmp_path),
+        ONTOLOGY_CACHE_FILENAME="feinschmecker.rdf",
+    )
+    return app
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(app_module.redis, "from_url", lambda *args, **kwargs: client)
+    return client
+
+
+def test_holder_does_not_release_a_lock_taken_over_by_another_process(app, fake_redis, monkeypatch):
+    def slow_download(app, url):
+        # Our lock expired during the download and another process took it
+        fake_redis.store[ONTOLOGY_DOWNLOAD_LOCK_KEY] = "other-host:1"
+        return Path(app.config["ONTOLOGY_CACHE_DIR"]) / "feinschmecker.rdf"
+
+    monkeypatch.setattr(app_module, "download_ontology", slow_download)
+
+    fetch_ontology(app, "https://example.org/onto.rdf")
+
+    assert fake_redis.store[ONTOLOGY_DOWNLOAD_LOCK_KEY] == "other-host:1"
+
+
+def test_holder_releases_its_own_lock(app, fake_redis, monkeypatch):
+    monkeypatch.setattr(app_module, "download_ontology", lambda app, url: Path("onto.rdf"))
+
+    fetch_ontology(app, "https://example.org/onto.rdf")
+
+    assert ONTOLOGY_DOWNLOAD_LOCK_KEY not in fake_redis.store
+    assert fake_redis.published
+
+
+def test_waiter_without_ready_signal_downloads_itself(app, fake_redis, monkeypatch):
+    fake_redis.store[ONTOLOGY_DOWNLOAD_LOCK_KEY] = "other-host:1"
+    # A stale or partial file from an earlier run must not be used as is
+    (Path(app.config["ONTOLOGY_CACHE_DIR"]) / "feinschmecker.rdf").write_text("<partial")
+    downloads = []
+
+    def download(app, url):
+        downloads.append(url)
+        return Path("fresh.rdf")
+
+    monkeypatch.setattr(app_module, "download_ontology", download)
+
+    assert fetch_ontology(app, "https://example.org/onto.rdf") == Path("fresh.rdf")
+    assert downloads == ["https://example.org/onto.rdf"]
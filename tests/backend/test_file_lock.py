@@ -0,0 +1,82 @@
+"""
+Tests for the flock-based lock shared by the quadstore build and the journal.
+"""
+
+import fcntl
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from backend.app.utils.file_lock import file_lock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+HOLD_FOREVER = """
+import sys, time
+from backend.app.utils.file_lock import file_lock
+with file_lock(sys.argv[1]):
+    print("locked", flush=True)
+    time.sleep(600)
+"""
+
+
+def _is_locked(lock_path):
+    fd = os.open(lock_path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def test_lock_is_exclusive_and_released_on_exit(tmp_path):
+    lock_path = tmp_path / "onto.lock"
+
+    with file_lock(lock_path):
+        assert _is_locked(lock_path)
+
+    assert not _is_locked(lock_path)
+
+
+def test_waiter_gets_the_lock_after_the_holder_leaves(tmp_path):
+    lock_path = tmp_path / "onto.lock"
+    order = []
+
+    with file_lock(lock_path):
+        def wait():
+            with file_lock(lock_path):
+                order.append("waiter")
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.2)
+        order.append("holder")
+
+    waiter.join(timeout=5)
+    assert order == ["holder", "waiter"]
+
+
+def test_killed_holder_does_not_leave_a_stale_lock(tmp_path):
+    lock_path = tmp_path / "onto.lock"
+    holder = subprocess.Popen(
+        [sys.executable, "-c", HOLD_FOREVER, str(lock_path)],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        assert _is_locked(lock_path)
+    finally:
+        holder.send_signal(signal.SIGKILL)
+        holder.wait()
+        holder.stdout.close()
+
+    assert not _is_locked(lock_path)
@@ -0,0 +1,95 @@
+"""
+Tests for creating and updating recipe individuals.
+"""
+
+import pytest
+from owlready2 import World
+
+from ontology.classes import Recipe
+from ontology.individuals import (
+    clear_individual_caches,
+    create_single_recipe,
+    createIndividual,
+    delete_recipe_individual,
+)
+from ontology.setup import create_kg
+
+RECIPE = {
+    "title": "Idempotency Test Cake",
+    "instructions": "Mix and bake.",
+    "ingredients": [
+        {"id": "flour", "amount": 200.0, "unit": "g"},
+        {"id": "egg", "amount": 2.0},
+    ],
+    "time": 45,
+    "difficulty": 2,
+    "meal_type": "Breakfast",
+    "vegan": False,
+    "vegetarian": True,
+    "nutrients": {"kcal": 350.0, "protein": 8.0, "fat": 12.0, "carbs": 50.0},
+}
+
+
+@pytest.fixture
+def kg():
+    clear_individual_caches()
+    graph = create_kg("tests", destroy_existing=True)
+    yield graph
+    graph.destroy()
+    clear_individual_caches()
+
+
+def test_first_create_reports_a_change(kg):
+    recipe, changed = create_single_recipe(dict(RECIPE), target_kg=kg)
+
+    assert changed is True
+    assert recipe.has_recipe_name == [RECIPE["title"]]
+
+
+def test_repeating_an_unchanged_recipe_changes_nothing(kg):
+    create_single_recipe(dict(RECIPE), target_kg=kg)
+    triples = len(list(kg.get_triples()))
+
+    recipe, changed = create_single_recipe(dict(RECIPE), target_kg=kg)
+
+    assert changed is False
+    assert len(list(kg.get_triples())) == triples
+    assert recipe.has_recipe_name == [RECIPE["title"]]
+
+
+def test_modified_recipe_reports_a_change(kg):
+    create_single_recipe(dict(RECIPE), target_kg=kg)
+
+    recipe, changed = create_single_recipe(dict(RECIPE, instructions="Mix, rest and bake."), target_kg=kg)
+
+    assert changed is True
+    assert recipe.has_instructions == ["Mix, rest and bake."]
+
+
+def test_delete_reports_whether_the_recipe_existed(kg):
+    create_single_recipe(dict(RECIPE), target_kg=kg)
+
+    assert delete_recipe_individual("idempotency_test_cake", target_kg=kg) is True
+    assert delete_recipe_individual("idempotency_test_cake", target_kg=kg) is False
+
+
+def test_same_name_in_another_namespace_is_not_reused(kg):
+    other = kg.get_namespace("http://example.org/other/")
+    with kg:
+        foreign = Recipe("idempotency_test_cake", namespace=other)
+
+    recipe, existed = createIndividual("Idempotency Test Cake", Recipe, target_kg=kg)
+
+    assert existed is False
+    assert recipe is not foreign
+    assert recipe.iri == kg.base_iri + "idempotency_test_cake"
+
+
+def test_index_is_not_shared_by_ontologies_with_the_same_iri(kg):
+    create_single_recipe(dict(RECIPE), target_kg=kg)
+    twin = World().get_ontology(kg.base_iri)
+
+    recipe, existed = createIndividual("Idempotency Test Cake", Recipe, target_kg=twin)
+
+    assert existed is False
+    assert recipe.namespace.ontology is twin
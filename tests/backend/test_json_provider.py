@@ -0,0 +1,44 @@
+"""
+Tests for the orjson-backed Flask JSON provider.
+"""
+
+import decimal
+
+import pytest
+from flask import Flask
+
+from backend.app.utils.json_provider import OrjsonProvider
+
+
+@pytest.fixture
+def provider():
+    app = Flask("test")
+    app.json = OrjsonProvider(app)
+    return app.json
+
+
+def test_keys_are_sorted_by_default(provider):
+    assert provider.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+
+def test_sort_keys_can_be_turned_off(provider):
+    assert provider.dumps({"b": 1, "a": 2}, sort_keys=False) == '{"b":1,"a":2}'
+
+
+def test_non_string_keys_are_serialized(provider):
+    assert provider.dumps({2: "x", "1": "y"}) == '{"1":"y","2":"x"}'
+
+
+def test_indent_is_honoured(provider):
+    assert provider.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_unknown_types_use_flask_fallback(provider):
+    assert provider.dumps({"price": decimal.Decimal("1.50")}) == '{"price":"1.50"}'
+
+
+def test_loads_accepts_text_and_bytes(provider):
+    assert provider.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert provider.loads(b'{"a": true}') == {"a": True}
+    with pytest.raises(ValueError):
+        provider.loads("{not json")
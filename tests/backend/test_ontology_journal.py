@@ -0,0 +1,76 @@
+"""
+Tests for the append-only journal of recipe changes.
+"""
+
+import pytest
+
+from backend.app.tasks.ontology_journal import OntologyJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return OntologyJournal(tmp_path / "feinschmecker.nt")
+
+
+def test_missing_journal_has_no_generation(journal):
+    assert journal.generation() is None
+    assert journal.read_since(None, 0) == ([], 0, None, False)
+    # A caller that had applied a generation must reload the base file
+    assert journal.read_since("1", 10)[3] is True
+
+
+def test_reset_starts_an_empty_generation(journal):
+    generation, offset = journal.reset()
+
+    assert journal.generation() == generation
+    assert journal.path.stat().st_size == offset
+    assert journal.read_since(generation, offset) == ([], offset, generation, False)
+
+
+def test_read_since_returns_only_new_entries(journal):
+    generation, start = journal.reset()
+    first_end = journal.append({"op": "delete", "name": "a"})
+    second_end = journal.append({"op": "delete", "name": "b"})
+
+    entries, offset, current, reset = journal.read_since(generation, start)
+    assert [e["name"] for e in entries] == ["a", "b"]
+    assert (offset, current, reset) == (second_end, generation, False)
+
+    entries, offset, _, _ = journal.read_since(generation, first_end)
+    assert [e["name"] for e in entries] == ["b"]
+    assert offset == second_end
+
+
+def test_partially_written_line_is_not_read(journal):
+    generation, start = journal.reset()
+    end = journal.append({"op": "delete", "name": "a"})
+    with open(journal.path, "ab") as f:
+        f.write(b'{"op": "delete", "na')
+
+    entries, offset, _, _ = journal.read_since(generation, start)
+
+    assert [e["name"] for e in entries] == ["a"]
+    assert offset == end
+
+
+def test_new_generation_replays_from_the_start(journal):
+    old_generation, _ = journal.reset()
+    old_end = journal.append({"op": "delete", "name": "a"})
+
+    generation, start = journal.reset()
+    assert generation != old_generation
+    end = journal.append({"op": "delete", "name": "b"})
+
+    # The old offset is meaningless in the new generation
+    entries, offset, current, reset = journal.read_since(old_generation, old_end)
+    assert reset is True
+    assert current == generation
+    assert [e["name"] for e in entries] == ["b"]
+    assert offset == end
+
+
+def test_lock_uses_a_file_next_to_the_ontology(journal):
+    with journal.lock():
+        assert journal.lock_path.is_file()
+    # The lock file stays so every process keeps locking the same inode
+    assert journal.lock_path.is_file()
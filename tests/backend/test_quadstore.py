@@ -0,0 +1,119 @@
+"""
+Tests for the persistent ontology quadstore used by the Flask app.
+
+Owlready2's ``default_world`` is process-global, so every load runs in a
+fresh interpreter.
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+import backend.app as app_module
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ONTOLOGY_FILE = PROJECT_ROOT / "data" / "feinschmecker.nt"
+
+QUERY = """
+    SELECT ?recipe ?name WHERE {
+        ?recipe <https://jaron.sprute.com/uni/actionable-knowledge-representation/feinschmecker/has_recipe_name> ?name .
+    }
+"""
+
+LOAD_SCRIPT = textwrap.dedent("""
+    import json, sqlite3, sys
+    from pathlib import Path
+    from flask import Flask
+    from owlready2 import World, default_world
+    from backend.app import open_ontology_quadstore
+
+    mode, cache_dir, source, query = sys.argv[1:]
+    if mode == "parse":
+        world = World()
+        world.get_ontology(Path(source).as_uri()).load()
+    else:
+        app = Flask("test")
+        app.config.update(
+            ONTOLOGY_CACHE_DIR=cache_dir,
+            ONTOLOGY_QUADSTORE_FILENAME="onto.sqlite3",
+        )
+        open_ontology_quadstore(app, Path(source))
+        world = default_world
+        # The world must not keep a connection to the file open
+        assert world.graph.db.execute("PRAGMA database_list").fetchone()[2] == ""
+    rows = sorted([str(getattr(value, "iri", value)) for value in row] for row in world.sparql(query))
+    print(json.dumps(rows))
+""")
+
+
+def _load(mode, cache_dir):
+    """Load the ontology in a subprocess and return the sorted query rows."""
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, mode, str(cache_dir), str(ONTOLOGY_FILE), QUERY],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.skipif(not ONTOLOGY_FILE.exists(), reason="ontology data file missing")
+def test_reopened_quadstore_matches_fresh_parse(tmp_path):
+    expected = _load("parse", tmp_path)
+    assert expected
+
+    built = _load("quadstore", tmp_path)
+    quadstore = tmp_path / "onto.sqlite3"
+    mtime = quadstore.stat().st_mtime_ns
+
+    reopened = _load("quadstore", tmp_path)
+
+    assert built == expected
+    assert reopened == expected
+    # The second load reused the store instead of parsing again
+    assert quadstore.stat().st_mtime_ns == mtime
+
+
+def test_build_holds_the_file_lock(tmp_path, monkeypatch):
+    lock_path = tmp_path / "onto.sqlite3.lock"
+    seen = {}
+
+    def build(app, source_path, quadstore, iri_path):
+        fd = os.open(lock_path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            seen["locked"] = False
+        except BlockingIOError:
+            seen["locked"] = True
+        finally:
+            os.close(fd)
+        raise RuntimeError("parse failed")
+
+    # Pretend the world is still empty so the quadstore path is taken
+    monkeypatch.setattr(app_module, "default_world", SimpleNamespace(graph=()))
+    monkeypatch.setattr(app_module, "_build_quadstore", build)
+    app = Flask("test")
+    app.config.update(ONTOLOGY_CACHE_DIR=str(tmp_path), ONTOLOGY_QUADSTORE_FILENAME="onto.sqlite3")
+    source = tmp_path / "onto.nt"
+    source.write_text("")
+
+    with pytest.raises(RuntimeError):
+        app_module.open_ontology_quadstore(app, source)
+
+    assert seen == {"locked": True}
+    # A failed build does not leave the lock held
+    fd = os.open(lock_path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        os.close(fd)
@@ -0,0 +1,110 @@
+"""
+Tests for the SPARQL query builder and its prepared parameters.
+"""
+
+from pathlib import Path
+
+import pytest
+from owlready2 import get_ontology
+
+from backend.app.services.query_builder import (
+    RecipeQueryBuilder,
+    build_count_query,
+    build_query_params,
+)
+from backend.app.services.recipe_service import RecipeService
+
+DATA_FILE = Path(__file__).resolve().parents[2] / "data" / "feinschmecker.nt"
+
+
+def test_params_follow_sorted_filter_keys():
+    filters = {
+        "vegan": True,
+        "meal_type": "Lunch",
+        "ingredients": ["Egg", "flour"],
+        "calories_bigger": 100.0,
+    }
+
+    assert build_query_params(filters) == [100.0, "egg", "flour", "Lunch", True]
+
+
+def test_placeholders_match_params():
+    filters = {"vegan": True, "ingredients": ["egg", "fl(o)ur"], "time": 30.0}
+    query = RecipeQueryBuilder().build_query(filters)
+    params = build_query_params(filters)
+
+    # ingredients -> ??1, ??2; time -> ??3; vegan -> ??4
+    assert params == ["egg", "fl(o)ur", 30.0, True]
+    assert "CONTAINS(LCASE(?ing_namea), ??1)" in query
+    assert 'regex(?ing_nameaa, ??2, "i")' in query
+    assert "?time_amount < ??3" in query
+    assert "is_vegan ??4" in query
+    assert "??5" not in query
+
+
+def test_regex_ingredients_keep_their_case():
+    assert build_query_params({"ingredients": ["Egg", "^Egg$"]}) == ["egg", "^Egg$"]
+
+
+def test_non_ascii_ingredients_use_the_regex_match():
+    filters = {"ingredients": ["Äpfel", "egg"]}
+    query = RecipeQueryBuilder().build_query(filters)
+
+    # LCASE would not lowercase the stored "Ä"
+    assert build_query_params(filters) == ["Äpfel", "egg"]
+    assert 'regex(?ing_namea, ??1, "i")' in query
+    assert "CONTAINS(LCASE(?ing_nameaa), ??2)" in query
+
+
+def test_filter_values_never_reach_the_query_text():
+    filters = {"ingredients": ['egg" . } DROP', "o'nion"], "meal_type": 'Lunch" }'}
+
+    for query in (RecipeQueryBuilder().build_query(filters, limit=5, offset=0), build_count_query(filters)):
+        assert "DROP" not in query
+        assert "o'nion" not in query
+        assert "Lunch" not in query
+
+
+def test_pagination_is_appended_as_integers():
+    query = RecipeQueryBuilder().build_query({}, limit="20", offset=40)
+
+    assert query.endswith(" LIMIT 20 OFFSET 40")
+
+
+needs_data = pytest.mark.skipif(not DATA_FILE.exists(), reason="ontology data file missing")
+
+
+@pytest.fixture(scope="module")
+def service():
+    return RecipeService(get_ontology(DATA_FILE.as_uri()).load())
+
+
+@needs_data
+def test_quotes_in_values_are_safe(service):
+    recipes, total = service.get_recipes(
+        {"ingredients": ['egg" . } #', "o'nion"], "meal_type": "Lunch'\""}, 1, 5
+    )
+
+    assert recipes == []
+    assert total == 0
+
+
+@needs_data
+def test_plain_ingredients_match_case_insensitively(service):
+    _, lower = service.get_recipes({"ingredients": ["egg"]}, 1, 5)
+    _, upper = service.get_recipes({"ingredients": ["EGG"]}, 1, 5)
+
+    assert lower > 0
+    assert upper == lower
+
+
+@needs_data
+def test_non_ascii_ingredients_match_case_insensitively(service):
+    ingredient = service.ontology.search_one(has_ingredient_name="gruyère sliced")
+    ingredient.has_ingredient_name = ["GRUYÈRE sliced"]
+    try:
+        _, total = service.get_recipes({"ingredients": ["gruyère"]}, 1, 5)
+    finally:
+        ingredient.has_ingredient_name = ["gruyère sliced"]
+
+    assert total == 1
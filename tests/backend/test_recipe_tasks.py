@@ -0,0 +1,208 @@
+"""
+Tests for the recipe change journal used by the Celery workers.
+
+Each test works on a copy of the bundled ontology and its own journal, so
+recipe changes never touch data/feinschmecker.nt.
+"""
+
+import errno
+import shutil
+from pathlib import Path
+
+import pytest
+from owlready2 import get_ontology
+
+from backend.config import get_config
+from backend.app.tasks import recipe_tasks
+from backend.app.tasks.ontology_journal import OntologyJournal
+
+DATA_FILE = Path(__file__).resolve().parents[2] / "data" / "feinschmecker.nt"
+
+SOUP = {
+    "title": "Journal Test Soup",
+    "instructions": "Boil the water.",
+    "ingredients": [{"id": "water"}],
+}
+
+pytestmark = pytest.mark.skipif(not DATA_FILE.exists(), reason="ontology data file missing")
+
+
+def _reload(onto, path):
+    with open(path, "rb") as fileobj:
+        onto.load(reload=True, fileobj=fileobj, format="ntriples")
+    recipe_tasks.clear_individual_caches()
+
+
+def _has_recipe(onto, title):
+    return onto.search_one(iri=f"*{recipe_tasks.onthologifyName(title)}") is not None
+
+
+@pytest.fixture
+def onto(tmp_path, monkeypatch):
+    """Fresh copy of the ontology wired up as this worker's journaled ontology."""
+    path = tmp_path / "feinschmecker.nt"
+    shutil.copy(DATA_FILE, path)
+
+    monkeypatch.setattr(recipe_tasks, "_journal", OntologyJournal(path))
+    monkeypatch.setattr(recipe_tasks, "_journal_generation", None)
+    monkeypatch.setattr(recipe_tasks, "_journal_offset", 0)
+    monkeypatch.setattr(recipe_tasks, "_journal_entries", 0)
+    monkeypatch.setattr(recipe_tasks, "_ontology_version", None)
+    monkeypatch.setattr(recipe_tasks, "_compaction_pending", False)
+    monkeypatch.setattr(recipe_tasks, "_publish_version_to_redis", lambda version, local_path=None: version)
+    monkeypatch.setattr(get_config(), "ONTOLOGY_JOURNAL_COMPACT_EVERY", 1000)
+
+    ontology = get_ontology(DATA_FILE.as_uri())
+    _reload(ontology, path)
+    return ontology
+
+
+def test_commit_change_journals_the_change(onto):
+    assert recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+
+    assert _has_recipe(onto, SOUP["title"])
+    journal = recipe_tasks._get_journal()
+    entries, offset, generation, _ = journal.read_since(None, 0)
+    assert entries == [{"op": "create", "recipe": SOUP}]
+    assert recipe_tasks._ontology_version == f"{generation}:{offset}"
+
+
+def test_failed_append_drops_the_change_from_memory(onto, monkeypatch):
+    # One journaled change first, so the rebuild has something to replay
+    first = dict(SOUP, title="Journal Test Stew")
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": first})
+    version = recipe_tasks._ontology_version
+    journal = recipe_tasks._get_journal()
+
+    def disk_full(entry):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(journal, "append", disk_full)
+
+    with pytest.raises(OSError):
+        recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+
+    assert not _has_recipe(onto, SOUP["title"])
+    assert _has_recipe(onto, first["title"])
+    assert recipe_tasks._ontology_version == version
+
+
+def test_unchanged_entries_are_not_journaled(onto):
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+    version = recipe_tasks._ontology_version
+
+    assert not recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+    assert recipe_tasks._ontology_version == version
+
+
+def _become_fresh_worker(onto, path, monkeypatch):
+    """Forget all in-memory state, like a worker that only has the base file."""
+    _reload(onto, path)
+    monkeypatch.setattr(recipe_tasks, "_journal_generation", recipe_tasks._get_journal().generation())
+    monkeypatch.setattr(recipe_tasks, "_journal_offset", 0)
+    monkeypatch.setattr(recipe_tasks, "_journal_entries", 0)
+
+
+def test_catch_up_replays_changes_of_other_workers(onto, monkeypatch):
+    journal = recipe_tasks._get_journal()
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+    version = recipe_tasks._ontology_version
+
+    _become_fresh_worker(onto, journal.ontology_path, monkeypatch)
+    assert not _has_recipe(onto, SOUP["title"])
+
+    with journal.lock():
+        recipe_tasks._catch_up(onto)
+
+    assert _has_recipe(onto, SOUP["title"])
+    assert recipe_tasks._ontology_version == version
+
+
+class _Done:
+    """Stand-in for the future of a compaction that already ran."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def add_done_callback(self, callback):
+        pass
+
+
+def test_compaction_folds_the_journal_into_the_file(onto, monkeypatch):
+    journal = recipe_tasks._get_journal()
+    monkeypatch.setattr(get_config(), "ONTOLOGY_JOURNAL_COMPACT_EVERY", 1)
+    monkeypatch.setattr(get_config(), "ONTOLOGY_COMPACT_DELAY", 0)
+    # Run the compaction inline instead of on the executor
+    monkeypatch.setattr(recipe_tasks._compact_executor, "submit", lambda fn, *args: _Done(fn(*args)))
+
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+
+    generation = journal.generation()
+    assert journal.read_since(generation, 0)[0] == []
+    assert recipe_tasks._journal_entries == 0
+
+    # A worker starting from the compacted file alone sees the change
+    _reload(onto, journal.ontology_path)
+    assert _has_recipe(onto, SOUP["title"])
+
+
+def test_replay_after_crash_between_save_and_reset_is_harmless(onto, monkeypatch):
+    journal = recipe_tasks._get_journal()
+    stew = dict(SOUP, title="Journal Test Stew")
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": stew})
+    recipe_tasks._commit_change(onto, {"op": "create", "recipe": SOUP})
+    recipe_tasks._commit_change(onto, {"op": "delete", "name": recipe_tasks.onthologifyName(stew["title"])})
+
+    # Compaction crashed after saving the file but before resetting the journal,
+    # so the next worker replays entries the file already contains
+    recipe_tasks._save_atomically(onto, journal.ontology_path)
+
+    _become_fresh_worker(onto, journal.ontology_path, monkeypatch)
+    with journal.lock():
+        recipe_tasks._catch_up(onto)
+
+    assert _has_recipe(onto, SOUP["title"])
+    assert not _has_recipe(onto, stew["title"])
+
+
+def test_search_runs_under_the_ontology_lock(onto, monkeypatch):
+    seen = {}
+
+    def get_recipes(service, filters, page, per_page):
+        seen["locked"] = recipe_tasks._ontology_lock.locked()
+        seen["version"] = service.version
+        return [], 0
+
+    monkeypatch.setattr(recipe_tasks, "_get_ontology_for_tasks", lambda: onto)
+    monkeypatch.setattr(recipe_tasks.RecipeService, "get_recipes", get_recipes)
+    monkeypatch.setattr(recipe_tasks, "_ontology_version", "1:10")
+
+    result = recipe_tasks.search_recipes_async({"vegan": True}, 1, 20)
+
+    assert result["total"] == 0
+    assert seen == {"locked": True, "version": "1:10"}
+
+
+def test_search_skips_caches_without_a_journal_generation(onto, monkeypatch):
+    seen = {}
+
+    def get_recipes(service, filters, page, per_page):
+        seen["version"] = service.version
+        return [], 0
+
+    def no_cache(*args):
+        raise AssertionError("search cache used without an ontology version")
+
+    monkeypatch.setattr(recipe_tasks, "_get_ontology_for_tasks", lambda: onto)
+    monkeypatch.setattr(recipe_tasks.RecipeService, "get_recipes", get_recipes)
+    monkeypatch.setattr(recipe_tasks, "_get_cached_search", no_cache)
+    monkeypatch.setattr(recipe_tasks, "_cache_search", no_cache)
+    # No journal file exists yet
+    with recipe_tasks._get_journal().lock():
+        recipe_tasks._catch_up(onto)
+
+    recipe_tasks.search_recipes_async({"vegan": True}, 1, 20)
+
+    assert recipe_tasks._ontology_version is None
+    # RecipeService only caches counts when it has a version
+    assert seen == {"version": None}
@@ -0,0 +1,98 @@
+"""
+Tests for recipe request validation.
+"""
+
+import pytest
+from flask import Flask
+
+from backend.config import get_config
+from backend.app.utils.validators.recipe_validator import (
+    ValidationError,
+    validate_recipe_filters,
+    validate_recipe_payload,
+)
+
+
+@pytest.fixture
+def app():
+    app = Flask("test")
+    app.config.from_object(get_config("testing"))
+    with app.app_context():
+        yield app
+
+
+def test_filters_are_a_plain_dict_without_pagination(app):
+    filters, page, per_page = validate_recipe_filters({
+        "vegan": "true",
+        "ingredients": "egg, flour",
+        "calories_min": "100",
+        "page": "2",
+        "per_page": "5",
+    })
+
+    assert type(filters) is dict
+    assert filters == {
+        "vegan": True,
+        "ingredients": ["egg", "flour"],
+        "calories_bigger": 100.0,
+    }
+    assert (page, per_page) == (2, 5)
+
+    # Callers own the result and may change it
+    filters["meal_type"] = "Lunch"
+
+
+def test_pagination_defaults(app):
+    filters, page, per_page = validate_recipe_filters({})
+
+    assert filters == {}
+    assert page == 1
+    assert per_page == app.config["DEFAULT_PAGE_SIZE"]
+
+
+def test_invalid_filters_raise(app):
+    with pytest.raises(ValidationError) as excinfo:
+        validate_recipe_filters({"difficulty": "9", "per_page": "0"})
+
+    assert set(excinfo.value.errors) == {"difficulty", "per_page"}
+
+
+def test_payload_values_are_coerced(app):
+    payload = {
+        "title": "Cake",
+        "time": "45",
+        "difficulty": "2",
+        "vegan": "no",
+        "ingredients": [{"id": "flour", "amount": "200"}, {"name": "salt", "amount": ""}],
+        "nutrients": {"kcal": "350", "fat": None},
+        "extra": "kept",
+    }
+
+    validated = validate_recipe_payload(payload)
+
+    assert validated == {
+        "title": "Cake",
+        "time": 45,
+        "difficulty": 2,
+        "vegan": False,
+        "ingredients": [{"id": "flour", "amount": 200.0}, {"name": "salt"}],
+        "nutrients": {"kcal": 350.0, "fat": 0.0},
+        "extra": "kept",
+    }
+    # The request body itself is left alone
+    assert payload["time"] == "45"
+    assert payload["ingredients"][0]["amount"] == "200"
+
+
+def test_payload_errors_are_collected_per_field(app):
+    with pytest.raises(ValidationError) as excinfo:
+        validate_recipe_payload({
+            "title": " ",
+            "difficulty": 7,
+            "meal_type": "Brunch",
+            "ingredients": [{"amount": 1}, "egg"],
+        })
+
+    errors = excinfo.value.errors
+    assert set(errors) == {"title", "difficulty", "meal_type", "ingredients"}
+    assert len(errors["ingredients"]) == 2
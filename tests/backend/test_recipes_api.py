@@ -0,0 +1,76 @@
+"""
+Tests for the recipe API endpoints.
+"""
+
+import pytest
+from flask import Flask
+
+from backend.config import get_config
+
+
+@pytest.fixture
+def recipes_api(flask_app):
+    # The module can only be imported once create_app has set up the limiter
+    from backend.app.api import recipes
+
+    recipes._validate_filters_cached.cache_clear()
+    return recipes
+
+
+def test_cached_filters_cannot_be_mutated(flask_app, recipes_api):
+    query = (("ingredients", "egg,flour"),)
+    with flask_app.app_context():
+        filters, _, _ = recipes_api._validate_filters_cached(query, recipes_api._validation_config())
+
+    with pytest.raises(TypeError):
+        filters["vegan"] = True
+    with pytest.raises(AttributeError):
+        filters["ingredients"].append("milk")
+    assert filters["ingredients"] == ("egg", "flour")
+
+
+def test_validation_cache_follows_app_config(flask_app, recipes_api):
+    query = (("per_page", "50"),)
+    with flask_app.app_context():
+        _, _, per_page = recipes_api._validate_filters_cached(query, recipes_api._validation_config())
+    assert per_page == 50
+
+    other = Flask("other")
+    other.config.from_object(get_config("testing"))
+    other.config["MAX_PAGE_SIZE"] = 10
+    with other.app_context():
+        with pytest.raises(recipes_api.ValidationError):
+            recipes_api._validate_filters_cached(query, recipes_api._validation_config())
+
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.test_client()
+
+
+@pytest.mark.parametrize("method, url", [("post", "/recipes"), ("put", "/recipes/some_cake")])
+def test_oversized_recipe_body_is_rejected_unparsed(client, flask_app, monkeypatch, method, url):
+    monkeypatch.setitem(flask_app.config, "MAX_RECIPE_BODY_BYTES", 64)
+
+    response = getattr(client, method)(url, data="{" + " " * 100 + "}", content_type="application/json")
+
+    assert response.status_code == 413
+    assert response.get_json()["error"]["code"] == "PAYLOAD_TOO_LARGE"
+
+
+@pytest.mark.parametrize("method, url", [("post", "/recipes"), ("put", "/recipes/some_cake")])
+@pytest.mark.parametrize("kwargs, field", [
+    ({"data": "title=Cake", "content_type": "application/x-www-form-urlencoded"}, "body"),
+    ({"data": "{not json", "content_type": "application/json"}, "body"),
+    ({"json": ["not", "an", "object"]}, "body"),
+    ({"json": {"instructions": "Bake."}}, "title"),
+    ({"json": {"title": "Cake", "time": "soon"}}, "time"),
+    ({"json": {"title": "Cake", "nutrients": {"kcal": -1}}}, "nutrients"),
+])
+def test_invalid_recipe_body_is_rejected(client, method, url, kwargs, field):
+    response = getattr(client, method)(url, **kwargs)
+
+    assert response.status_code == 400
+    error = response.get_json()["error"]
+    assert error["code"] == "VALIDATION_ERROR"
+    assert any(detail.startswith(f"{field}:") for detail in error["details"])
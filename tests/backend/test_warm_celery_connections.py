@@ -0,0 +1,42 @@
+"""
+Tests for warming up the Celery connections at worker start.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from flask import Flask
+
+import backend.app as app_module
+from backend.app import warm_celery_connections
+
+
+def test_background_warm_up_does_not_block_on_a_hanging_ping(monkeypatch):
+    release = threading.Event()
+    pinged = threading.Event()
+
+    def ping():
+        pinged.set()
+        release.wait(5)
+        raise ConnectionError("Redis is down")
+
+    fake_celery = SimpleNamespace(backend=SimpleNamespace(client=SimpleNamespace(ping=ping)))
+    monkeypatch.setattr(app_module, "celery", fake_celery)
+
+    thread = warm_celery_connections(Flask("test"))
+
+    assert pinged.wait(5)
+    assert thread.is_alive()
+    release.set()
+    thread.join(5)
+    # The failure was logged, not raised
+    assert not thread.is_alive()
+
+
+def test_create_app_does_not_warm_up(monkeypatch):
+    def warm(app):
+        raise AssertionError("create_app must not open Celery connections")
+
+    monkeypatch.setattr(app_module, "warm_celery_connections", warm)
+
+    app_module.create_app("testing")